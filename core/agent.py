@@ -13,124 +13,195 @@ All inputs should be normalized before being passed to the agent's decision func
 import numpy as np
 import core.config as config
 
-class Agent:
+class GenomeLayout:
     """
-    Neural network agent with shared hidden layer and two output heads:
-    - Flappy head: output[0] = jump
-    - Dino head: output[1] = jump, output[2] = duck
+    Describes how a flat genome vector maps onto the network weights.
+    A single layout is shared by every agent of a population.
+
+    The network is a stack of tanh hidden layers followed by two sigmoid heads:
+    - Flappy head: 1 output (jump)
+    - Dino head: 2 outputs (jump, duck)
     """
 
-    def __init__(self, input_size, hidden_size=config.HIDDEN_LAYER_ONE_UNITS):
+    def __init__(self, input_size, hidden_sizes=config.HIDDEN_LAYER_SIZES):
+        """
+        :param input_size: Number of game features, without the one-hot game encoding
+        :param hidden_sizes: Width of each hidden layer (an int means a single layer)
+        """
+        if isinstance(hidden_sizes, int):
+            hidden_sizes = (hidden_sizes,)
+        if not hidden_sizes:
+            raise ValueError("At least one hidden layer is required")
+
         self.input_size = input_size + 2  # Add 2 for one-hot game encoding
-        self.hidden_size = hidden_size
+        self.hidden_sizes = tuple(hidden_sizes)
 
         # Output sizes
         self.flappy_output_size = 1
         self.dino_output_size = 2
 
-        
-        # Genome layout:
-        # Input → Hidden
-        self.w1_size = self.input_size * self.hidden_size
-        self.b1_size = self.hidden_size
-
-        # Hidden → Flappy Output
-        self.wf_size = self.hidden_size * self.flappy_output_size
-        self.bf_size = self.flappy_output_size
+        # Genome layout, each layer stored as weights (out x in) then bias:
+        # Input → Hidden 1 → ... → Hidden n, then Hidden n → Flappy, then Hidden n → Dino
+        # Each entry is (offset, out_size, in_size).
+        offset = 0
+        in_size = self.input_size
+        self.hidden_layers = []
+        for out_size in self.hidden_sizes:
+            self.hidden_layers.append((offset, out_size, in_size))
+            offset += out_size * in_size + out_size
+            in_size = out_size
+
+        self.heads = {}
+        for name, out_size in (("flappy", self.flappy_output_size), ("dino", self.dino_output_size)):
+            self.heads[name] = (offset, out_size, in_size)
+            offset += out_size * in_size + out_size
+
+        self.genome_size = offset
+
+    @classmethod
+    def from_dict(cls, topology: dict) -> "GenomeLayout":
+        """
+        Rebuilds a layout from the topology stored alongside a saved model.
+        """
+        return cls(topology["input_size"], topology["hidden_sizes"])
 
-        # Hidden → Dino Output
-        self.wd_size = self.hidden_size * self.dino_output_size
-        self.bd_size = self.dino_output_size
+    @classmethod
+    def from_genome_size(cls, input_size: int, genome_size: int) -> "GenomeLayout":
+        """
+        Infers the layout of a model saved before topologies were recorded,
+        which always had a single hidden layer.
+        """
+        width = input_size + 2
+        hidden_size, remainder = divmod(genome_size - 3, width + 4)
+        if remainder or hidden_size <= 0:
+            raise ValueError(f"Genome of size {genome_size} does not match a single hidden layer network")
+        return cls(input_size, (hidden_size,))
 
-        self.genome_size = (
-            self.w1_size + self.b1_size +
-            self.wf_size + self.bf_size +
-            self.wd_size + self.bd_size
-        )
+    def to_dict(self) -> dict:
+        """
+        :return: Topology description that can be saved with a model
+        """
+        return {"input_size": self.input_size - 2, "hidden_sizes": list(self.hidden_sizes)}
 
-        self.genome = np.random.uniform(-1, 1, self.genome_size)
+    @property
+    def hidden_size(self):
+        """
+        Width of the last hidden layer, which feeds the output heads.
+        """
+        return self.hidden_sizes[-1]
 
+    def layer(self, genomes: np.ndarray, spec: tuple) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Views the weights and bias of one layer inside a genome vector or a
+        (num_agents, genome_size) genome matrix. No data is copied.
 
-        
-    def clone_with_mutation(self, mutation_rate=0.05, mutation_strength=0.5):
+        :param spec: (offset, out_size, in_size) entry of hidden_layers or heads
+        :return: Tuple (weights [..., out, in], bias [..., out])
         """
-        Creates a mutated copy of this agent.
+        offset, out_size, in_size = spec
+        weights_end = offset + out_size * in_size
+        weights = genomes[..., offset:weights_end].reshape(genomes.shape[:-1] + (out_size, in_size))
+        bias = genomes[..., weights_end:weights_end + out_size]
+        return weights, bias
 
-        :param mutation_rate: Chance to mutate each gene
-        :param mutation_strength: Max change per mutation
-        :return: A new mutated Agent instance
+    def hidden_weights(self, genomes: np.ndarray) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        :return: (weights, bias) of every hidden layer, input side first
         """
-        new_agent = Agent(self.input_size - 2, self.hidden_size)
-        new_agent.genome = np.copy(self.genome)
+        return [self.layer(genomes, spec) for spec in self.hidden_layers]
 
-        for i in range(len(new_agent.genome)):
-            if np.random.rand() < mutation_rate:
-                new_agent.genome[i] += np.random.uniform(-mutation_strength, mutation_strength)
+    def head_weights(self, genomes: np.ndarray, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        :param name: "flappy" or "dino"
+        :return: (weights, bias) of that output head
+        """
+        return self.layer(genomes, self.heads[name])
 
-        return new_agent
-    
-    def decide(self, inputs: list[float]) -> tuple[bool, bool, bool]:
+    def random_genomes(self, num_agents: int, dtype=np.float64, rng: np.random.Generator | None = None) -> np.ndarray:
         """
-        Expects inputs including one-hot game encoding as last 2 elements: [features..., is_flappy, is_dino]
-        Returns a tuple: (flappy_jump, dino_jump, duck)
+        :param dtype: Storage type of the genes (float64, float32 or float16)
+        :param rng: Generator to draw from; a fresh unseeded one if None
+        :return: (num_agents, genome_size) matrix of uniformly initialized genomes
         """
-        inputs = np.array(inputs)
-        idx = 0
+        rng = rng if rng is not None else np.random.default_rng()
+        return rng.uniform(-1, 1, (num_agents, self.genome_size)).astype(dtype, copy=False)
 
-        # Shared hidden layer
-        w1 = self.genome[idx:idx + self.w1_size].reshape(self.hidden_size, self.input_size)
-        idx += self.w1_size
-        b1 = self.genome[idx:idx + self.b1_size]
-        idx += self.b1_size
 
-        hidden = np.tanh(np.dot(w1, inputs) + b1)
+class Agent:
+    """
+    Neural network agent with shared hidden layers and two output heads:
+    - Flappy head: output[0] = jump
+    - Dino head: output[1] = jump, output[2] = duck
 
-        # Determine game from one-hot input
-        is_flappy = inputs[-2] == 1.0
-        is_dino = inputs[-1] == 1.0
+    An agent only holds its genome and a reference to a shared GenomeLayout,
+    so it can be a cheap view onto one row of a Population genome matrix.
+    """
 
-        flappy_jump = dino_jump = duck = False
+    __slots__ = ("layout", "genome")
 
-        if is_flappy:
-            wf = self.genome[idx:idx + self.wf_size].reshape(self.flappy_output_size, self.hidden_size)
-            idx += self.wf_size
-            bf = self.genome[idx:idx + self.bf_size]
-            idx += self.bf_size
+    def __init__(self, input_size, hidden_sizes=config.HIDDEN_LAYER_SIZES, genome=None, layout=None):
+        """
+        :param input_size: Number of game features, without the one-hot game encoding
+        :param hidden_sizes: Width of each hidden layer
+        :param genome: Optional genome vector; randomly initialized if None
+        :param layout: Optional shared layout; built from input_size/hidden_sizes if None
+        """
+        self.layout = layout if layout is not None else GenomeLayout(input_size, hidden_sizes)
+        self.genome = genome if genome is not None else self.layout.random_genomes(1)[0]
 
-            output = self.sigmoid(np.dot(wf, hidden) + bf)
-            flappy_jump = output[0] > 0.5
+    @property
+    def input_size(self):
+        return self.layout.input_size
 
-        elif is_dino:
-            idx += self.wf_size + self.bf_size  # skip flappy weights
+    @property
+    def hidden_size(self):
+        return self.layout.hidden_size
 
-            wd = self.genome[idx:idx + self.wd_size].reshape(self.dino_output_size, self.hidden_size)
-            idx += self.wd_size
-            bd = self.genome[idx:idx + self.bd_size]
-            idx += self.bd_size
+    @property
+    def genome_size(self):
+        return self.layout.genome_size
 
-            output = self.sigmoid(np.dot(wd, hidden) + bd)
-            dino_jump = output[0] > 0.5
-            duck = output[1] > 0.5
+    def clone_with_mutation(self, mutation_rate=0.05, mutation_strength=0.5, rng=None):
+        """
+        Creates a mutated copy of this agent.
 
+        :param mutation_rate: Chance to mutate each gene
+        :param mutation_strength: Max change per mutation
+        :param rng: numpy Generator to draw from; a fresh unseeded one if None
+        :return: A new mutated Agent instance
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        new_agent = Agent(None, genome=np.copy(self.genome), layout=self.layout)
+
+        mask = rng.random(self.genome_size) < mutation_rate
+        new_agent.genome += mask * rng.uniform(-mutation_strength, mutation_strength, self.genome_size)
+
+        return new_agent
+    
+    def decide(self, inputs: list[float]) -> tuple[bool, bool, bool]:
+        """
+        Expects inputs including one-hot game encoding as last 2 elements: [features..., is_flappy, is_dino]
+        Returns a tuple: (flappy_jump, dino_jump, duck)
+        """
+        flappy_jump, dino_jump, duck, _ = self.decide_with_activations(inputs)
         return flappy_jump, dino_jump, duck
 
     def decide_with_activations(self, inputs: list[float]) -> tuple[bool, bool, bool, dict]:
         """
         Like decide(), but also returns a dict of activations for visualization.
+        'layers' holds every layer's activations (input first) and 'weights' the
+        matrices connecting consecutive layers.
         """
         inputs = np.array(inputs)
-        activations = {'input': inputs}
-        idx = 0
-
-        # Shared hidden layer
-        w1 = self.genome[idx:idx + self.w1_size].reshape(self.hidden_size, self.input_size)
-        idx += self.w1_size
-        b1 = self.genome[idx:idx + self.b1_size]
-        idx += self.b1_size
-
-        hidden = np.tanh(np.dot(w1, inputs) + b1)
+        activations = {'input': inputs, 'layers': [inputs], 'weights': []}
+
+        # Shared hidden layers
+        hidden = inputs
+        for w, b in self.layout.hidden_weights(self.genome):
+            hidden = np.tanh(np.dot(w, hidden) + b)
+            activations['layers'].append(hidden)
+            activations['weights'].append(w)
         activations['hidden'] = hidden
-        activations['w1'] = w1
 
         # Determine game from one-hot input
         is_flappy = inputs[-2] == 1.0
@@ -139,10 +210,7 @@ class Agent:
         flappy_jump = dino_jump = duck = False
 
         if is_flappy:
-            wf = self.genome[idx:idx + self.wf_size].reshape(self.flappy_output_size, self.hidden_size)
-            idx += self.wf_size
-            bf = self.genome[idx:idx + self.bf_size]
-            idx += self.bf_size
+            wf, bf = self.layout.head_weights(self.genome, "flappy")
 
             output = self.sigmoid(np.dot(wf, hidden) + bf)
             flappy_jump = output[0] > 0.5
@@ -150,12 +218,7 @@ class Agent:
             activations['w_output'] = wf
 
         elif is_dino:
-            idx += self.wf_size + self.bf_size  # skip flappy weights
-
-            wd = self.genome[idx:idx + self.wd_size].reshape(self.dino_output_size, self.hidden_size)
-            idx += self.wd_size
-            bd = self.genome[idx:idx + self.bd_size]
-            idx += self.bd_size
+            wd, bd = self.layout.head_weights(self.genome, "dino")
 
             output = self.sigmoid(np.dot(wd, hidden) + bd)
             dino_jump = output[0] > 0.5
@@ -163,6 +226,10 @@ class Agent:
             activations['output'] = output
             activations['w_output'] = wd
 
+        if 'output' in activations:
+            activations['layers'].append(activations['output'])
+            activations['weights'].append(activations['w_output'])
+
         return flappy_jump, dino_jump, duck, activations
 
     def sigmoid(self, x):
@@ -1,4 +1,7 @@
-HIDDNE_LAYERS = 1
+HIDDEN_LAYERS = 1
 HIDDEN_LAYER_ONE_UNITS = 32
 HIDDEN_LAYER_TWO_UNITS = 16
 OUTPUT_SIZE = 3
+
+# Widths of the hidden layer stack used for new populations
+HIDDEN_LAYER_SIZES = (HIDDEN_LAYER_ONE_UNITS, HIDDEN_LAYER_TWO_UNITS)[:HIDDEN_LAYERS]
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""
+evaluation.py
+
+Streaming fitness evaluation for populations that are too large to simulate
+at once. The genome matrix (in RAM or memory-mapped) is split into fixed-size
+chunks; each chunk is loaded, evaluated and reduced into a single fitness
+vector, so memory use is bounded by the chunk size.
+
+For the chunks to be comparable, the evaluate callable must build its world
+from a fixed seed (see core.rng), so every chunk faces the same level.
+
+ParallelEvaluator spreads the same work over a pool of worker processes: the
+population is split into one contiguous shard per worker, each worker
+evaluates its shard chunk by chunk, and the fitness arrays are joined in
+order. As every agent is simulated independently on the same level, the
+result equals single-process evaluation. The evaluate callable is sent to the
+workers, so it must be picklable: a module-level function or a
+functools.partial of one, not a lambda.
+
+Genomes and fitness do not travel through the pool's pipes. Populations
+moved into shared memory with ParallelEvaluator.share (or memory-mapped ones)
+reach a worker as a handle plus its slice bounds, and workers write fitness
+straight into a shared results block, so the per-generation message is the
+evaluate callable (with its level) and a few integers.
+
+Several evaluations of the same population (e.g. one per game) can run at
+once with ParallelEvaluator.evaluate_concurrently: the shards of all of them
+are queued on the pool together, each writes its own column of the results
+block, and the time each one took is reported.
+"""
+import multiprocessing
+from multiprocessing import resource_tracker
+import os
+import signal
+import time
+import numpy as np
+from core.population import Population
+from core.shared import SharedArray
+
+
+def evaluate_in_chunks(population: Population, evaluate, chunk_size: int) -> np.ndarray:
+    """
+    Evaluates a population chunk by chunk.
+
+    :param population: Population to evaluate; its genomes may be memory-mapped
+    :param evaluate: Callable taking an in-memory Population chunk and returning its fitness scores
+    :param chunk_size: Max number of agents simulated at the same time
+    :return: Fitness vector of length len(population)
+    """
+    num_agents = len(population)
+    fitness = np.empty(num_agents)
+
+    for start in range(0, num_agents, chunk_size):
+        stop = min(start + chunk_size, num_agents)
+        fitness[start:stop] = evaluate(population.chunk(start, stop))
+
+    return fitness
+
+
+def evaluate_shard(evaluate, population: Population, start: int, stop: int, chunk_size: int,
+                   results: SharedArray, offset: int, column: int) -> float:
+    """
+    Worker entry point: evaluates rows [start, stop) of the population and
+    writes their fitness to one column of results, from row offset on.
+
+    :return: Seconds spent
+    """
+    began = time.perf_counter()
+    shard = Population(population.genomes[start:stop], population.layout)
+    results.array[offset:offset + stop - start, column] = evaluate_in_chunks(shard, evaluate, chunk_size)
+    return time.perf_counter() - began
+
+
+def init_worker():
+    """
+    Pool initializer: restores the default SIGTERM action, which a forked worker
+    may have inherited overridden (pygame installs its own handler), so that
+    Pool.terminate() can stop the workers.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+class ParallelEvaluator:
+    """
+    Evaluates populations across a pool of worker processes. The pool is
+    started once and reused for every generation; call close() (or use the
+    evaluator as a context manager) to stop it.
+    """
+
+    def __init__(self, num_workers: int | None = None):
+        """
+        :param num_workers: Number of worker processes; all CPUs if None. With 1 the
+                            population is evaluated in the calling process and no pool is started.
+        """
+        self.num_workers = num_workers if num_workers is not None else os.cpu_count()
+        if self.num_workers > 1 and os.name == "posix":
+            # Workers must share this process's resource tracker; one of their own
+            # would unlink the shared blocks they attached to when they exit
+            resource_tracker.ensure_running()
+        self.pool = multiprocessing.Pool(self.num_workers, initializer=init_worker) if self.num_workers > 1 else None
+        self.results = None  # Shared fitness block, one column per concurrent evaluation
+        self.blocks = []     # Shared blocks created by share(), unlinked on close
+
+    def shards(self, num_agents: int) -> list[tuple[int, int]]:
+        """
+        :return: Contiguous [start, stop) row ranges, one per worker, as even as possible
+        """
+        bounds = np.linspace(0, num_agents, min(self.num_workers, num_agents) + 1).astype(int)
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    def share(self, population: Population) -> Population:
+        """
+        Moves an in-memory population into shared memory so workers read it
+        without copying. Genomes evolved into it in place (evolve_population
+        with out=) are seen by the workers as well. Memory-mapped populations,
+        and any population when no pool is running, are returned unchanged.
+
+        :return: Shared population; its block is freed by close()
+        """
+        if self.pool is None or population.shared is not None or isinstance(population.genomes, np.memmap):
+            return population
+        population = population.to_shared()
+        self.blocks.append(population.shared)
+        return population
+
+    def results_block(self, num_agents: int, columns: int) -> SharedArray:
+        """
+        :return: The shared fitness block, reallocated if its shape changed
+        """
+        if self.results is None or self.results.shape != (num_agents, columns):
+            if self.results is not None:
+                self.results.unlink()
+            self.results = SharedArray((num_agents, columns))
+        return self.results
+
+    def shard_tasks(self, population: Population, evaluate, chunk_size: int, results: SharedArray, column: int) -> list[tuple]:
+        """
+        :return: evaluate_shard arguments for every shard of the population
+        """
+        if population.shared is not None or isinstance(population.genomes, np.memmap):
+            # Workers attach to the genomes and read their own slice
+            return [(evaluate, population, start, stop, chunk_size, results, start, column)
+                    for start, stop in self.shards(len(population))]
+        return [(evaluate, population.chunk(start, stop), 0, stop - start, chunk_size, results, start, column)
+                for start, stop in self.shards(len(population))]
+
+    def evaluate(self, population: Population, evaluate, chunk_size: int) -> np.ndarray:
+        """
+        Evaluates a population across the workers.
+
+        :param population: Population to evaluate; its genomes may be memory-mapped
+        :param evaluate: Picklable callable taking an in-memory Population chunk and returning its fitness scores
+        :param chunk_size: Max number of agents a worker simulates at the same time
+        :return: Fitness vector of length len(population), identical to evaluate_in_chunks
+        """
+        if self.pool is None:
+            return evaluate_in_chunks(population, evaluate, chunk_size)
+        fitness, _ = self.evaluate_concurrently(population, {"fitness": evaluate}, chunk_size)
+        return fitness["fitness"]
+
+    def evaluate_concurrently(self, population: Population, evaluates: dict, chunk_size: int) -> tuple[dict, dict]:
+        """
+        Runs several evaluations of the same population at the same time, e.g.
+        one per game. The shards of all of them share the pool, so the total
+        wall time approaches that of the slowest one rather than their sum.
+        Without a pool they run one after the other.
+
+        :param evaluates: Picklable evaluate callables by name
+        :param chunk_size: Max number of agents a worker simulates at the same time
+        :return: Tuple (fitness, timings), both by name. Fitness vectors are identical
+                 to evaluate_in_chunks; timings are (seconds until the evaluation
+                 finished, seconds its shards spent in the workers)
+        """
+        fitness = {}
+        timings = {}
+        if self.pool is None:
+            for name, evaluate in evaluates.items():
+                began = time.perf_counter()
+                fitness[name] = evaluate_in_chunks(population, evaluate, chunk_size)
+                elapsed = time.perf_counter() - began
+                timings[name] = (elapsed, elapsed)
+            return fitness, timings
+
+        results = self.results_block(len(population), len(evaluates))
+        finished = {}
+        began = time.perf_counter()
+        pending = {
+            # The callback runs in the pool's result thread as soon as the last shard of this evaluation is done
+            name: self.pool.starmap_async(
+                evaluate_shard, self.shard_tasks(population, evaluate, chunk_size, results, column),
+                callback=lambda _, name=name: finished.__setitem__(name, time.perf_counter())
+            )
+            for column, (name, evaluate) in enumerate(evaluates.items())
+        }
+        for column, (name, result) in enumerate(pending.items()):
+            busy = sum(result.get())
+            fitness[name] = results.array[:, column].copy()
+            timings[name] = (finished[name] - began, busy)
+        return fitness, timings
+
+    def close(self, terminate: bool = False):
+        """
+        Stops the worker processes and frees the shared blocks.
+
+        :param terminate: Kill the workers instead of letting them finish pending work,
+                          e.g. when an evaluation was interrupted
+        """
+        if self.pool is not None:
+            if terminate:
+                self.pool.terminate()
+            else:
+                self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for block in self.blocks + ([self.results] if self.results is not None else []):
+            block.unlink()
+        self.blocks = []
+        self.results = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(terminate=exc_type is not None)
@@ -1,28 +1,78 @@
 import numpy as np
-from core.agent import Agent
+from core.population import Population
 
-def evolve_agents(old_agents: list[Agent], fitness_scores: list[float], retain_top: float = 0.2, mutate_rate: float = 0.1):
+def evolve_genomes(genomes: np.ndarray, fitness_scores, retain_top: float = 0.2, mutate_rate: float = 0.1, mutation_strength: float = 0.5, out: np.ndarray | None = None, chunk_size: int | None = None, rng: np.random.Generator | None = None) -> np.ndarray:
     """
-    Evolves a population of agents using elitism and mutation.
+    Evolves a population genome matrix using elitism and mutation.
+    Selection, copying and mutation run as whole-matrix operations.
 
-    :param old_agents: List of agents from the previous generation
+    :param genomes: (num_agents, genome_size) matrix from the previous generation
     :param fitness_scores: Corresponding fitness scores
     :param retain_top: Top X% of agents to keep
-    :param mutate_rate: Chance of mutation
-    :return: List of new agents
+    :param mutate_rate: Chance of mutation per gene
+    :param mutation_strength: Max change per mutation
+    :param out: Optional preallocated matrix (e.g. memory-mapped) for the new generation; must not alias genomes
+    :param chunk_size: Rows written per step. None processes the whole matrix at once;
+                       set it to bound memory when genomes/out are memory-mapped.
+                       The result does not depend on it.
+    :param rng: Generator for parent choice and mutation; a fresh unseeded one if None
+    :return: New (num_agents, genome_size) matrix; elites first, then mutated children
+
+    With out given, the only allocations are the parent indices and one chunk
+    of scratch space for the mutation draws. The mutation mask and the noise
+    come from two streams spawned from rng, each filled in row order, so every
+    row gets the same draws whatever the chunk size.
     """
-    num_agents = len(old_agents)
+    rng = rng if rng is not None else np.random.default_rng()
+    num_agents = genomes.shape[0]
     retain_length = max(1, int(num_agents * retain_top))
+    chunk_size = chunk_size or num_agents
 
     # Sort agents by fitness (descending)
     sorted_indices = np.argsort(fitness_scores)[::-1]
-    elites = [old_agents[i] for i in sorted_indices[:retain_length]]
+    elite_indices = sorted_indices[:retain_length]
+
+    # Elites are copied as-is, the rest are mutated copies of randomly chosen elites
+    parents = rng.choice(elite_indices, num_agents - retain_length)
+    sources = np.concatenate([elite_indices, parents])
+    mask_rng, noise_rng = rng.spawn(2)
 
-    # Create new generation by cloning + mutating
-    new_agents = elites.copy()
-    while len(new_agents) < num_agents:
-        parent = np.random.choice(elites)
-        child = parent.clone_with_mutation(mutation_rate=mutate_rate)
-        new_agents.append(child)
+    new_genomes = np.empty_like(genomes) if out is None else out
+    draws = np.empty((min(chunk_size, num_agents), genomes.shape[1]))
+    mask = np.empty(draws.shape, dtype=bool)
+    for start in range(0, num_agents, chunk_size):
+        block = new_genomes[start:start + chunk_size]
+        rows = len(block)
+        np.take(genomes, sources[start:start + rows], axis=0, out=block)
 
-    return new_agents
\ No newline at end of file
+        # Same draws as mask_rng.random(...) < mutate_rate and noise_rng.uniform(-s, s, ...), written into scratch
+        mask_rng.random(out=draws[:rows])
+        np.less(draws[:rows], mutate_rate, out=mask[:rows])
+        mask[:max(0, retain_length - start)] = False
+        noise_rng.random(out=draws[:rows])
+        draws[:rows] *= 2 * mutation_strength
+        draws[:rows] -= mutation_strength
+        draws[:rows] *= mask[:rows]
+        block += draws[:rows]
+
+    return new_genomes
+
+def evolve_population(population: Population, fitness_scores, retain_top: float = 0.2, mutate_rate: float = 0.1, out: Population | None = None, chunk_size: int | None = None, rng: np.random.Generator | None = None) -> Population:
+    """
+    Evolves an array-backed population using elitism and mutation.
+
+    :param population: Population from the previous generation
+    :param fitness_scores: Corresponding fitness scores
+    :param retain_top: Top X% of agents to keep
+    :param mutate_rate: Chance of mutation
+    :param out: Optional population whose genome matrix is overwritten with the new generation
+    :param chunk_size: Rows written per step (see evolve_genomes)
+    :param rng: Generator for parent choice and mutation
+    :return: New population sharing the same layout (out, if given)
+    """
+    new_genomes = evolve_genomes(
+        population.genomes, fitness_scores,
+        retain_top=retain_top, mutate_rate=mutate_rate,
+        out=None if out is None else out.genomes, chunk_size=chunk_size, rng=rng
+    )
+    return out if out is not None else Population(new_genomes, population.layout)
@@ -0,0 +1,495 @@
+"""
+inference.py
+
+Defines the PopulationNetwork class, which evaluates the neural networks of a
+whole population at once. Every genome is stacked into one weight tensor per
+layer, so a single batched matmul produces the decisions of all agents for a
+frame instead of one Agent.decide call per agent.
+
+The genome layout and the decision rule are identical to Agent.decide.
+
+CompiledPolicy is a per-game specialization of a PopulationNetwork: input
+columns that are constant for that game are folded into the first hidden bias
+and dropped, and only that game's head is evaluated, thresholding logits
+directly instead of going through a sigmoid. A compiled policy can also run
+at reduced precision (float32, float16 or int8 with per-layer scales);
+decision_agreement() measures how often that changes a decision.
+
+CompactingPolicy restricts a compiled policy to the agents that are still
+alive, so late-episode frames only pay for the few survivors.
+
+MultiTaskPolicy evaluates a mixed batch of Flappy and Dino observations with
+one pass through the shared hidden layers and routes every row to the head of
+its game, so both games can be stepped in lockstep with one call per frame.
+Wrapped in a CompactingPolicy with one copy of the agents per game, the
+lockstep batch is evaluated without gathering weights every frame.
+"""
+import copy
+import numpy as np
+from core.agent import Agent, GenomeLayout
+
+# Feature columns that a game always leaves at a fixed value: {column: value}.
+# The one-hot game encoding (last two columns) is added per layout in CompiledPolicy.
+CONSTANT_FEATURES = {
+    "flappy": {7: 0.0, 8: 0.0, 9: 0.0},  # unused for Flappy
+    "dino": {},
+}
+
+# Weight precisions supported by CompiledPolicy
+PRECISIONS = ("float64", "float32", "float16", "int8")
+
+# CompactingPolicy re-gathers the weights of the survivors once fewer than
+# this fraction of its current agents are still alive
+COMPACTION_THRESHOLD = 0.5
+
+
+def batched_dense(weights: np.ndarray, bias: np.ndarray, x: np.ndarray, rows: np.ndarray | None, scale: np.ndarray | None = None) -> np.ndarray:
+    """
+    Batched affine transform: one (out x in) matrix per agent row.
+
+    :param rows: Agent index of each row of x, or None for all agents in order.
+                 With None, x may also hold several such batches back to back
+                 (e.g. one per game); the weights are broadcast, not copied.
+    :param scale: Per-agent dequantization scale for int8 weights, None for float weights
+    """
+    if rows is not None:
+        weights, bias = weights[rows], bias[rows]
+        scale = None if scale is None else scale[rows]
+    batches = x.reshape(-1, len(weights), x.shape[1])
+    out = np.matmul(weights, batches[..., None])[..., 0]
+    if scale is not None:
+        out *= scale[:, None]
+    return (out + bias).reshape(len(x), -1)
+
+
+def quantize_layer(weights: np.ndarray, bias: np.ndarray, precision: str, out: tuple | None = None) -> tuple:
+    """
+    Converts one batched layer to the given precision.
+
+    :param out: Tuple (weights, bias, scale) from an earlier call with the same
+                shapes and precision, overwritten in place instead of allocating
+    :return: Tuple (weights, bias, scale). For "int8" the weights are stored as
+             int8 with one symmetric scale per agent and layer; otherwise scale is None.
+    """
+    if precision == "int8":
+        scale = np.abs(weights).max(axis=(1, 2)) / 127.0
+        scale[scale == 0] = 1.0
+        quantized = np.round(weights / scale[:, None, None])
+        if out is None:
+            return quantized.astype(np.int8), bias.astype(np.float32), scale.astype(np.float32)
+        np.copyto(out[0], quantized, casting="unsafe")
+        np.copyto(out[2], scale, casting="same_kind")
+    elif out is None:
+        return np.ascontiguousarray(weights, dtype=precision), bias.astype(precision), None
+    else:
+        np.copyto(out[0], weights, casting="same_kind")
+    np.copyto(out[1], bias, casting="same_kind")
+    return out
+
+
+class PopulationNetwork:
+    """
+    Batched forward pass over the genomes of a population.
+    - Flappy head: decide_flappy() -> jump
+    - Dino head: decide_dino() -> (jump, duck)
+    """
+
+    def __init__(self, genomes: np.ndarray, layout: GenomeLayout):
+        """
+        :param genomes: (num_agents, genome_size) matrix, one genome per row
+        :param layout: Genome layout shared by all rows
+        """
+        self.layout = layout
+        self.set_genomes(genomes)
+
+    @classmethod
+    def from_agents(cls, agents: list[Agent]) -> "PopulationNetwork":
+        """
+        Stacks the genomes of a list of agents into a single network.
+        """
+        genomes = np.stack([agent.genome for agent in agents])
+        return cls(genomes, agents[0].layout)
+
+    @classmethod
+    def from_population(cls, population) -> "PopulationNetwork":
+        """
+        Builds a network directly on the genome matrix of a Population (no copy).
+        """
+        return cls(population.genomes, population.layout)
+
+    def set_genomes(self, genomes: np.ndarray):
+        """
+        Replaces the stacked genomes. The per-layer tensors are views into the
+        genome matrix, so no weights are copied.
+        """
+        self.genomes = genomes
+        self.num_agents = genomes.shape[0]
+
+        # (num_agents, out, in) weights and (num_agents, out) biases per layer
+        self.hidden_layers = self.layout.hidden_weights(genomes)
+        self.flappy_head = self.layout.head_weights(genomes, "flappy")
+        self.dino_head = self.layout.head_weights(genomes, "dino")
+
+    def hidden(self, inputs: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        Shared hidden layer activations for a batch of observations.
+
+        :param inputs: (batch, input_size) observations, one row per agent
+        :param rows: Agent index of each observation row. None means all agents, in order.
+        :return: (batch, hidden_size) activations of the last hidden layer
+        """
+        hidden = inputs
+        for weights, bias in self.hidden_layers:
+            hidden = np.tanh(batched_dense(weights, bias, hidden, rows))
+        return hidden
+
+    def decide_flappy(self, inputs: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        Flappy jump decisions for a batch of observations.
+
+        :return: Boolean array, True = jump
+        """
+        hidden = self.hidden(inputs, rows)
+        output = self.sigmoid(batched_dense(*self.flappy_head, hidden, rows))
+        return output[:, 0] > 0.5
+
+    def decide_dino(self, inputs: np.ndarray, rows: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Dino decisions for a batch of observations.
+
+        :return: Tuple of boolean arrays (jump, duck)
+        """
+        hidden = self.hidden(inputs, rows)
+        output = self.sigmoid(batched_dense(*self.dino_head, hidden, rows))
+        return output[:, 0] > 0.5, output[:, 1] > 0.5
+
+    def compile_for(self, game: str, precision: str = "float64") -> "CompiledPolicy":
+        """
+        Builds a policy specialized for one game (see CompiledPolicy).
+
+        :param game: "flappy" or "dino"
+        :param precision: One of PRECISIONS
+        """
+        return CompiledPolicy(self, game, precision)
+
+    def compile_multi(self, precision: str = "float64") -> "MultiTaskPolicy":
+        """
+        Builds a fused policy for mixed Flappy/Dino batches (see MultiTaskPolicy).
+
+        :param precision: One of PRECISIONS
+        """
+        return MultiTaskPolicy(self, precision)
+
+    def sigmoid(self, x):
+        return 1 / (1 + np.exp(-x))
+
+
+class CompiledPolicy:
+    """
+    Smaller per-game weight set derived from a PopulationNetwork.
+    - Constant input columns are folded into the first hidden layer bias and dropped
+    - Only the head of the compiled game is kept
+    - sigmoid(z) > 0.5 is evaluated as z > 0
+    - Weights are stored at the requested precision; float16 and int8 weights
+      are computed in float32, since NumPy has no fast half/integer matmul
+    """
+
+    def __init__(self, network: PopulationNetwork, game: str, precision: str = "float64"):
+        """
+        :param network: Network to specialize; weights are copied, so later
+                        changes to its genomes are not reflected
+        :param game: "flappy" or "dino"
+        :param precision: One of PRECISIONS
+        """
+        if game not in CONSTANT_FEATURES:
+            raise ValueError(f"Unknown game: {game}")
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+
+        layout = network.layout
+        self.game = game
+        self.layout = layout
+        self.num_agents = network.num_agents
+        self.precision = precision
+        self.compute_dtype = np.float64 if precision == "float64" else np.float32
+
+        constants = dict(CONSTANT_FEATURES[game])
+        constants[layout.input_size - 2] = 1.0 if game == "flappy" else 0.0  # One-hot: Flappy
+        constants[layout.input_size - 1] = 1.0 if game == "dino" else 0.0    # One-hot: Dino
+
+        self.constant_columns = np.array(sorted(constants))
+        self.constant_values = np.array([constants[c] for c in self.constant_columns])
+        self.live_columns = np.array([c for c in range(layout.input_size) if c not in constants])
+
+        self.hidden_layers = None
+        self.load(network)
+
+    def load(self, network: PopulationNetwork):
+        """
+        Compiles the weights of network. After the first call the existing
+        weight arrays are overwritten, so a policy can be reused for every
+        generation of a population of the same size.
+        """
+        if network.num_agents != self.num_agents:
+            raise ValueError(f"Network has {network.num_agents} agents, policy has {self.num_agents}")
+
+        # Fold constant inputs into the first hidden bias
+        w1, b1 = network.hidden_layers[0]
+        folded_w1 = np.ascontiguousarray(w1[:, :, self.live_columns])
+        folded_b1 = b1 + np.matmul(w1[:, :, self.constant_columns], self.constant_values)
+
+        hidden_layers = [(folded_w1, folded_b1)] + network.hidden_layers[1:]
+        head = network.flappy_head if self.game == "flappy" else network.dino_head
+
+        # Each layer is (weights, bias, scale)
+        if self.hidden_layers is None:
+            self.hidden_layers = [quantize_layer(w, b, self.precision) for w, b in hidden_layers]
+            self.head = quantize_layer(*head, self.precision)
+        else:
+            for (w, b), layer in zip(hidden_layers, self.hidden_layers):
+                quantize_layer(w, b, self.precision, out=layer)
+            quantize_layer(*head, self.precision, out=self.head)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Bytes held by the compiled weights, biases and scales.
+        """
+        return sum(
+            array.nbytes
+            for layer in self.hidden_layers + [self.head]
+            for array in layer if array is not None
+        )
+
+    def subset(self, rows: np.ndarray) -> "CompiledPolicy":
+        """
+        Returns a policy holding only the given agents, in the given order.
+        Weights are gathered once, so later decide() calls need no row indexing.
+        """
+        compact = copy.copy(self)
+        compact.hidden_layers = [
+            tuple(None if array is None else array[rows] for array in layer)
+            for layer in self.hidden_layers
+        ]
+        compact.head = tuple(None if array is None else array[rows] for array in self.head)
+        compact.num_agents = len(rows)
+        return compact
+
+    def logits(self, inputs: np.ndarray, rows: np.ndarray | None = None) -> np.ndarray:
+        """
+        Head pre-activations for a batch of observations.
+
+        :param inputs: (batch, input_size) full-width observations, or
+                       (batch, len(live_columns)) already compacted ones
+        :param rows: Agent index of each observation row. None means all agents, in order.
+        """
+        hidden = inputs if inputs.shape[1] == len(self.live_columns) else inputs[:, self.live_columns]
+        hidden = hidden.astype(self.compute_dtype, copy=False)
+        for weights, bias, scale in self.hidden_layers:
+            hidden = np.tanh(batched_dense(weights, bias, hidden, rows, scale))
+        return batched_dense(*self.head[:2], hidden, rows, self.head[2])
+
+    def decide(self, inputs: np.ndarray, rows: np.ndarray | None = None):
+        """
+        :return: Flappy: boolean jump array. Dino: tuple of boolean arrays (jump, duck).
+        """
+        logits = self.logits(inputs, rows)
+        if self.game == "flappy":
+            return logits[:, 0] > 0
+        return logits[:, 0] > 0, logits[:, 1] > 0
+
+    def verify_against_decide(self, population, inputs: np.ndarray) -> int:
+        """
+        Compares the compiled decisions with Agent.decide, one agent per row.
+
+        :param population: Population the policy was compiled from
+        :param inputs: (num_agents, input_size) full-width observations
+        :return: Number of agents whose decisions differ (0 when identical)
+        """
+        compiled = self.decide(inputs)
+        if self.game == "flappy":
+            compiled = (compiled,)
+
+        mismatches = 0
+        for i in range(self.num_agents):
+            flappy_jump, dino_jump, duck = population.agent(i).decide(inputs[i])
+            expected = (flappy_jump,) if self.game == "flappy" else (dino_jump, duck)
+            if tuple(bool(c[i]) for c in compiled) != tuple(bool(e) for e in expected):
+                mismatches += 1
+        return mismatches
+
+
+
+class CompactingPolicy:
+    """
+    Wraps a CompiledPolicy (or MultiTaskPolicy) and evaluates only a dense
+    block of agents that contains every survivor. Dead agents inside the block
+    are evaluated but ignored until survivors drop below COMPACTION_THRESHOLD
+    of the block; the block is then re-gathered from the survivors. This
+    avoids both a full population pass and a per-frame weight gather.
+
+    With copies > 1 every agent has that many global indices, one per stacked
+    batch: index c * num_agents + i is agent i in batch c (e.g. Flappy rows,
+    then Dino rows, for lockstep play with a MultiTaskPolicy).
+    """
+
+    def __init__(self, policy, threshold: float = COMPACTION_THRESHOLD, copies: int = 1):
+        self.full_policy = policy
+        self.threshold = threshold
+        self.copies = copies
+        self.reset()
+
+    def reset(self):
+        """
+        Returns to the full policy, e.g. after it was reloaded for a new generation.
+        """
+        self.policy = self.full_policy
+        self.indices = np.arange(self.copies * self.full_policy.num_agents)  # Global index of each block row
+
+    def compact(self, alive: np.ndarray):
+        """
+        Re-gathers the block if too few of its agents are still alive.
+
+        :param alive: Sorted global indices of the surviving agents
+        """
+        if len(alive) < self.threshold * len(self.indices):
+            self.indices = np.array(alive)
+            self.policy = self.full_policy.subset(self.indices % self.full_policy.num_agents)
+
+    def decide(self, inputs: np.ndarray, alive: np.ndarray, survivors: np.ndarray | None = None):
+        """
+        :param inputs: Observations of the surviving agents, one row per entry of alive
+        :param alive: Sorted global indices of the surviving agents
+        :param survivors: Sorted global indices of every survivor, if alive leaves some
+                          out this frame; they are kept in the block
+        :return: Decisions for the agents in alive (same format as CompiledPolicy.decide)
+        """
+        self.compact(alive if survivors is None else survivors)
+        if len(alive) == len(self.indices):
+            return self.policy.decide(inputs)
+
+        local = np.searchsorted(self.indices, alive)
+        batch = np.zeros((len(self.indices), inputs.shape[1]), dtype=inputs.dtype)
+        batch[local] = inputs
+
+        decisions = self.policy.decide(batch)
+        if isinstance(decisions, tuple):
+            return tuple(d[local] for d in decisions)
+        return decisions[local]
+
+class MultiTaskPolicy:
+    """
+    Fused policy over both output heads, used to step Flappy and Dino together.
+    - Every row of a batch goes through the shared hidden layers in one batched matmul
+    - Rows are then split by their one-hot game encoding and only the matching head is evaluated
+    - No inputs are folded, since the constant columns differ between the two games
+    - Weights are stored at the requested precision, as in CompiledPolicy
+    """
+
+    game = "multi"
+
+    def __init__(self, network: PopulationNetwork, precision: str = "float64"):
+        """
+        :param network: Network to wrap; weights are copied
+        :param precision: One of PRECISIONS
+        """
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}")
+
+        self.layout = network.layout
+        self.num_agents = network.num_agents
+        self.precision = precision
+        self.compute_dtype = np.float64 if precision == "float64" else np.float32
+
+        self.hidden_layers = None
+        self.load(network)
+
+    def load(self, network: PopulationNetwork):
+        """
+        Copies the weights of network, into the existing arrays after the first
+        call (see CompiledPolicy.load).
+        """
+        if network.num_agents != self.num_agents:
+            raise ValueError(f"Network has {network.num_agents} agents, policy has {self.num_agents}")
+
+        # Each layer is (weights, bias, scale)
+        if self.hidden_layers is None:
+            self.hidden_layers = [quantize_layer(w, b, self.precision) for w, b in network.hidden_layers]
+            self.heads = {
+                "flappy": quantize_layer(*network.flappy_head, self.precision),
+                "dino": quantize_layer(*network.dino_head, self.precision),
+            }
+        else:
+            for (w, b), layer in zip(network.hidden_layers, self.hidden_layers):
+                quantize_layer(w, b, self.precision, out=layer)
+            for game, head in (("flappy", network.flappy_head), ("dino", network.dino_head)):
+                quantize_layer(*head, self.precision, out=self.heads[game])
+
+    def subset(self, rows: np.ndarray) -> "MultiTaskPolicy":
+        """
+        Returns a policy holding only the given agents, in the given order
+        (see CompiledPolicy.subset). An agent may be listed more than once.
+        """
+        compact = copy.copy(self)
+        compact.hidden_layers = [
+            tuple(None if array is None else array[rows] for array in layer)
+            for layer in self.hidden_layers
+        ]
+        compact.heads = {
+            game: tuple(None if array is None else array[rows] for array in head)
+            for game, head in self.heads.items()
+        }
+        compact.num_agents = len(rows)
+        return compact
+
+    def decide(self, inputs: np.ndarray, rows: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Decisions for a batch that may mix observations of both games. An agent
+        may appear in several rows, e.g. once per game.
+
+        :param inputs: (batch, input_size) observations ending with the one-hot game encoding
+        :param rows: Agent index of each observation row. None means all agents, in order,
+                     or several such batches back to back (see batched_dense).
+        :return: Tuple of boolean arrays (flappy_jump, dino_jump, duck), one entry per row,
+                 False for the outputs of the other game (same as Agent.decide)
+        """
+        hidden = inputs.astype(self.compute_dtype, copy=False)
+        for weights, bias, scale in self.hidden_layers:
+            hidden = np.tanh(batched_dense(weights, bias, hidden, rows, scale))
+        if rows is None:
+            rows = np.arange(len(inputs)) % self.num_agents
+
+        is_flappy = inputs[:, -2] == 1.0
+        is_dino = ~is_flappy & (inputs[:, -1] == 1.0)
+
+        flappy_jump = np.zeros(len(inputs), dtype=bool)
+        dino_jump = np.zeros(len(inputs), dtype=bool)
+        duck = np.zeros(len(inputs), dtype=bool)
+
+        if is_flappy.any():
+            weights, bias, scale = self.heads["flappy"]
+            logits = batched_dense(weights, bias, hidden[is_flappy], rows[is_flappy], scale)
+            flappy_jump[is_flappy] = logits[:, 0] > 0
+        if is_dino.any():
+            weights, bias, scale = self.heads["dino"]
+            logits = batched_dense(weights, bias, hidden[is_dino], rows[is_dino], scale)
+            dino_jump[is_dino] = logits[:, 0] > 0
+            duck[is_dino] = logits[:, 1] > 0
+
+        return flappy_jump, dino_jump, duck
+
+def decision_agreement(reference, candidate, inputs: np.ndarray, rows: np.ndarray | None = None) -> float:
+    """
+    Fraction of observations on which two policies for the same game make
+    exactly the same decision, e.g. an int8 policy against its float64 reference.
+    Works for CompiledPolicy and MultiTaskPolicy alike.
+    """
+    expected = reference.decide(inputs, rows)
+    actual = candidate.decide(inputs, rows)
+    if not isinstance(expected, tuple):
+        expected, actual = (expected,), (actual,)
+
+    same = np.ones(len(inputs), dtype=bool)
+    for e, a in zip(expected, actual):
+        same &= e == a
+    return float(np.mean(same))
\ No newline at end of file
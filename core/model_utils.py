@@ -1,7 +1,7 @@
 import pickle
 import numpy as np
 import os
-from core.agent import Agent
+from core.agent import Agent, GenomeLayout
 
 
 def save_best_agent(agent: Agent, fitness: float, generation: int, save_path: str):
@@ -12,10 +12,13 @@ def save_best_agent(agent: Agent, fitness: float, generation: int, save_path: st
     best = load_best_agent(save_path)
 
     if best is None or fitness > best['fitness']:
+        # Stored as an array so the population's gene precision is preserved
         data = {
-            "genome": agent.genome.tolist(),
+            "genome": np.array(agent.genome),
+            "dtype": str(agent.genome.dtype),
             "fitness": fitness,
-            "generation": generation
+            "generation": generation,
+            "topology": agent.layout.to_dict()
         }
         with open(save_path, "wb") as f:
             pickle.dump(data, f)
@@ -35,10 +38,16 @@ def load_best_agent(save_path: str) -> dict | None:
 def create_agent_from_genome(
     genome: list[float],
     input_size: int,
+    topology: dict | None = None,
 ) -> Agent:
     """
     Creates an agent from a genome (used in replay/view mode).
+
+    :param topology: Topology saved with the model. Models saved without one
+                     are assumed to have a single hidden layer.
     """
-    agent = Agent(input_size)
-    agent.genome = np.array(genome)
-    return agent
\ No newline at end of file
+    if topology is not None:
+        layout = GenomeLayout.from_dict(topology)
+    else:
+        layout = GenomeLayout.from_genome_size(input_size, len(genome))
+    return Agent(None, genome=np.array(genome), layout=layout)
\ No newline at end of file
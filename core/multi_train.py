@@ -1,173 +1,406 @@
 # multi_train.py
 
 import time
-import pygame
-from core.agent import Agent
-from core.ga import evolve_agents
+from functools import partial
+import numpy as np
+from core.agent import GenomeLayout
+from core.inference import PopulationNetwork, CompactingPolicy, decision_agreement
+from core.population import Population
+from core.ga import evolve_population
+from core.evaluation import ParallelEvaluator
+from core.rng import derive_rng, episode_seed
 from core.model_utils import save_best_agent
 
-from games.flappy.core_game import GameCore as FlappyCore
-from games.flappy import config as flappy_config
+from games.flappy.world import FlappyWorld
+from games.flappy import observations as flappy_observations
 
-from games.dino.core_game import DinoCore
-from games.dino.dino import Dino
-from games.dino.obstacles import FlyingObstacle
-from games.dino import config as dino_config
+from games.dino.world import DinoWorld
+from games.dino import observations as dino_observations
+
+from games.tracks import TrackLibrary
 
 NUM_AGENTS = 2000
 INPUT_SIZE = 10
+# Root seed of all random streams (genomes, GA, levels); see core.rng
+RUN_SEED = 0
 MODEL_SAVE_PATH = "model/multigame_best.pkl"
 
-def get_flappy_inputs(bird, next_pipe):
-    if next_pipe:
-        dx = (next_pipe.x - bird.x) / flappy_config.SCREEN_WIDTH
-        dy = ((next_pipe.gap_y + next_pipe.gap_size / 2) - bird.y) / flappy_config.SCREEN_HEIGHT
-        gap_size = next_pipe.gap_size / flappy_config.SCREEN_HEIGHT
-        pipe_speed = next_pipe.speed / flappy_config.PIPE_SPEED
-        time_to_pipe = dx / (next_pipe.speed + 1e-5)
-    else:
-        dx = 1.0
-        dy = 0.0
-        gap_size = 0.0
-        pipe_speed = 1.0
-        time_to_pipe = 1.0
-
-    return [
-        bird.y / flappy_config.SCREEN_HEIGHT, 
-        bird.velocity_y / 10.0,               
-        dx,                                   
-        dy,                                   
-        gap_size,                             
-        pipe_speed,                           
-        time_to_pipe,                         
-        0.0, 0.0, 0.0, 1.0, 0.0
-    ]
-
-def get_dino_inputs(dino, obstacle):
-    if obstacle:
-        dx = (obstacle.x - dino.x) / dino_config.SCREEN_WIDTH
-        dy = (obstacle.y - dino.y) / dino_config.SCREEN_HEIGHT
-        obstacle_height = obstacle.height / dino_config.SCREEN_HEIGHT
-        obstacle_width = obstacle.width / dino_config.SCREEN_WIDTH
-        obstacle_speed = obstacle.speed / dino_config.BASE_SPEED
-        time_to_collision = dx / (obstacle.speed + 1e-5)
-        is_flying = 1.0 if isinstance(obstacle, FlyingObstacle) else 0.0
-        is_ground = 1.0 - is_flying
+# Out-of-core mode: set GENOME_MMAP_PATH to keep genomes in a memory-mapped .npy
+# file; agents are then simulated EVAL_CHUNK_SIZE at a time.
+GENOME_MMAP_PATH = None
+EVAL_CHUNK_SIZE = 10000
+# Rows the GA writes per step; bounds its scratch memory and does not change the offspring
+GA_CHUNK_SIZE = 10000
+
+# Worker processes for fitness evaluation; the population is split into one
+# contiguous shard per worker (see core.evaluation.ParallelEvaluator). Fitness
+# is identical for any number of workers. None uses every CPU.
+NUM_WORKERS = 1
+
+# Reduced precision: gene storage type and compiled policy precision
+# ("float64", "float32", "float16" or "int8"). With a non-float64 precision,
+# decisions are compared against float64 every AGREEMENT_SAMPLE_INTERVAL frames.
+GENOME_DTYPE = "float64"
+INFERENCE_PRECISION = "float64"
+AGREEMENT_SAMPLE_INTERVAL = 20
+
+# Episode caps per game
+FLAPPY_MAX_SCORE = 200
+DINO_MAX_SCORE = 100
+
+# Level tracks (see games.tracks) are built once per game and generation and
+# shared by every chunk. Set TRACK_LIBRARY_PATH to keep them on disk, where
+# later runs with the same seed reuse them.
+TRACK_LIBRARY_PATH = None
+
+# Decision interval: agents run their network every DECISION_INTERVAL frames;
+# physics still runs every frame. In between, HOLD_ACTIONS repeats the last
+# action (Flappy keeps jumping, Dino keeps jumping/ducking); otherwise no input
+# is given (Flappy does not jump, a Dino keeps its pose).
+DECISION_INTERVAL = 1
+HOLD_ACTIONS = False
+
+# Dino fast-forward: while no obstacle is on screen and the dinos' last actions
+# changed nothing, their observations and actions stay fixed until the next
+# spawn, so those frames are skipped (see DinoWorld.fast_forward). Fitness is
+# unchanged.
+DINO_FAST_FORWARD = True
+
+# Step Flappy and Dino together, with one fused inference call per frame for
+# both games. False evaluates them separately with per-game policies: with
+# NUM_WORKERS > 1 both games run at the same time on the pool, otherwise one
+# after the other. Either way the evaluation time is reported every generation.
+# Off by default: lockstep compacts its block to the survivors, but it must
+# step Dino frame by frame alongside Flappy, so it cannot fast-forward and is
+# still slower than the per-game path.
+LOCKSTEP_EVALUATION = False
+
+# Worlds, compiled policies and observation buffers, kept per process (so per
+# pool worker) and reused by every generation and chunk of the same size
+reusables = {}
+
+def reusable(key, build):
+    """
+    :return: The object kept under key in this process, built with build() on first use
+    """
+    if key not in reusables:
+        reusables[key] = build()
+    return reusables[key]
+
+def restart(world, seed, track):
+    """
+    Resets a reused FlappyWorld or DinoWorld for a new episode, as if it had just been built.
+
+    :param seed: Level seed, used when track is None
+    :param track: Precomputed level or None
+    """
+    world.rng = np.random.default_rng(seed)
+    world.track = track
+    world.clock.reset()
+    world.reset()
+    return world
+
+def compiled(network, game, precision):
+    """
+    :return: Policy for game ("flappy", "dino" or "multi") compiled from network into
+             this process's reusable weight buffers for that size and precision
+    """
+    key = ("policy", game, network.num_agents, precision)
+    if key not in reusables:
+        reusables[key] = network.compile_multi(precision) if game == "multi" else network.compile_for(game, precision)
     else:
-        dx = 1.0
-        dy = 0.0
-        obstacle_height = 0.0
-        obstacle_width = 0.0
-        obstacle_speed = 0.0
-        time_to_collision = 1.0
-        is_flying = 0.0
-        is_ground = 0.0
-
-    return [
-        dino.y / dino_config.SCREEN_HEIGHT,   # 1
-        dino.velocity_y / 10.0,               # 2
-        dx,                                   # 3
-        dy,                                   # 4
-        obstacle_height,                      # 5
-        obstacle_width,                       # 6
-        obstacle_speed,                       # 7
-        time_to_collision,                    # 8
-        is_flying,                            # 9
-        is_ground,                            #10
-        0.0,                                   #11 ← reserved for Flappy only
-        1.0                                    #12 ← One-hot: Dino
-    ]
-
-def evaluate_on_flappy(agents, bird_sprite, pipe_sprite):
-    flappy = FlappyCore(bird_sprite, pipe_sprite, num_agents=NUM_AGENTS)
-    scores = [0] * NUM_AGENTS
-    MAX_SCORE = 200
-
-    while flappy.alive and flappy.score < MAX_SCORE:
+        reusables[key].load(network)
+    return reusables[key]
+
+def compacting(network, game, precision):
+    """
+    :return: Reusable CompactingPolicy over compiled(network, game, precision), reset to all
+             agents. For "multi" it holds every agent twice: Flappy rows, then Dino rows.
+    """
+    policy = compiled(network, game, precision)
+    copies = 2 if game == "multi" else 1
+    wrapper = reusable(("compacting", game, network.num_agents, precision), lambda: CompactingPolicy(policy, copies=copies))
+    wrapper.reset()
+    return wrapper
+
+def flappy_fitness(score, time_alive):
+    """
+    :return: Selection fitness of Flappy birds: the score, ties broken by survival time (frames)
+    """
+    return score * 100 + time_alive / 10
+
+def dino_fitness(score):
+    """
+    :return: Selection fitness of dinos, on the same scale as flappy_fitness
+    """
+    return score * 100
+
+def report_agreement(game, precision, agreement):
+    if agreement:
+        print(f"\n{game} decision agreement ({precision} vs float64): {np.mean(agreement):.2%}")
+
+def report_timings(timings):
+    """
+    Prints how long each game's evaluation took and which one held the generation up.
+
+    :param timings: (wall seconds, worker seconds) by game, as returned by ParallelEvaluator.evaluate_concurrently
+    """
+    slowest = max(timings, key=lambda game: timings[game][0])
+    for game, (wall, busy) in timings.items():
+        note = " <- bottleneck" if game == slowest and len(timings) > 1 else ""
+        print(f"\n{game}: done after {wall:.2f}s, {busy:.2f}s of worker time{note}")
+
+def evaluate_on_flappy(population, precision=INFERENCE_PRECISION, seed=None, track=None,
+                       decision_interval=DECISION_INTERVAL, hold_actions=HOLD_ACTIONS):
+    """
+    :param seed: Level seed (anything np.random.default_rng accepts); the same seed gives the same pipes
+    :param track: Precomputed Flappy track; replaces the seed if given
+    :param decision_interval: Frames between network evaluations
+    :param hold_actions: Repeat the last action between decisions instead of not jumping
+    """
+    num_agents = len(population)
+    flappy = restart(reusable(("flappy", num_agents), lambda: FlappyWorld(num_agents=num_agents)), seed, track)
+    network = PopulationNetwork.from_population(population)
+    policy = compacting(network, "flappy", precision)
+    reference = compiled(network, "flappy", "float64") if precision != "float64" else None
+    observations = reusable(("flappy observations", num_agents), lambda: flappy_observations.allocate(num_agents))
+    decisions = np.zeros(num_agents, dtype=bool)  # Entries of dead birds are ignored
+    agreement = []
+    frame = 0
+    step = 0
+
+    while flappy.alive and flappy.score < FLAPPY_MAX_SCORE:
         print(f"Flappy Score: {flappy.score}", end="\r")
-        next_pipe = None
-        for pipe in flappy.pipes:
-            if pipe.x + pipe.width > flappy.birds[0].x:
-                next_pipe = pipe
-                break
-
-        decisions = []
-        for i, bird in enumerate(flappy.birds):
-            if not bird.alive:
-                decisions.append(False)
-                continue
-            inputs = get_flappy_inputs(bird, next_pipe)
-            
-            flappy_jump, _, _ = agents[i].decide(inputs)
-            decisions.append(flappy_jump)
-        flappy.update(agent_decisions=decisions)
-
-    for i, bird in enumerate(flappy.birds):
-        scores[i] = bird.score * 100 + bird.time_alive / 10
-
-    return scores
-
-def evaluate_on_dino(agents):
-    core = DinoCore()
-    dinos = [Dino(50, dino_config.SCREEN_HEIGHT - dino_config.GROUND_HEIGHT - dino_config.DINO_HEIGHT) for _ in range(NUM_AGENTS)]
-    scores = [0] * NUM_AGENTS
-
-    MAX_SCORE = 100
-
-    while any(d.alive for d in dinos) and max(d.score for d in dinos) < MAX_SCORE:
-        print(f"Dino Score: {max(d.score for d in dinos)}", end="\r")
-        core.update(dinos)
-
-        next_obstacle = core.get_next_obstacle()
-        for i, dino in enumerate(dinos):
-            if not dino.alive:
-                continue
-            inputs = get_dino_inputs(dino, next_obstacle)
-            _, dino_jump, duck = agents[i].decide(inputs)
-            if dino_jump:
-                dino.jump()
-                dino.stand_up()
-            elif duck:
-                dino.duck()
-            else:
-                dino.stand_up()
+        if step % decision_interval == 0:
+            alive = flappy.alive_indices()
+            inputs = flappy_observations.observe_world(flappy, alive, observations)
+            decisions[alive] = policy.decide(inputs, alive)
+
+            if reference is not None and frame % AGREEMENT_SAMPLE_INTERVAL == 0:
+                agreement.append(decision_agreement(reference, policy.full_policy, inputs, rows=alive))
+            frame += 1
+        elif not hold_actions:
+            decisions[:] = False
+
+        flappy.update(decisions)
+        step += 1
+
+    report_agreement("Flappy", precision, agreement)
+    return flappy_fitness(flappy.bird_score, flappy.bird_time_alive)
+
+def evaluate_on_dino(population, precision=INFERENCE_PRECISION, seed=None, track=None,
+                     decision_interval=DECISION_INTERVAL, hold_actions=HOLD_ACTIONS, fast_forward=DINO_FAST_FORWARD):
+    """
+    :param seed: Level seed (anything np.random.default_rng accepts); the same seed gives the same obstacles
+    :param track: Precomputed Dino track; replaces the seed if given
+    :param decision_interval: Frames between network evaluations
+    :param hold_actions: Repeat the last action between decisions instead of giving no input
+    :param fast_forward: Skip quiescent stretches straight to the next spawn
+    """
+    num_agents = len(population)
+    dino = restart(reusable(("dino", num_agents), lambda: DinoWorld(num_agents=num_agents)), seed, track)
+    network = PopulationNetwork.from_population(population)
+    policy = compacting(network, "dino", precision)
+    reference = compiled(network, "dino", "float64") if precision != "float64" else None
+    observations = reusable(("dino observations", num_agents), lambda: dino_observations.allocate(num_agents))
+    jump = np.zeros(num_agents, dtype=bool)  # Entries of dead dinos are ignored
+    duck = np.zeros(num_agents, dtype=bool)
+    agreement = []
+    frame = 0
+    step = 0
+    quiet = False
+
+    # Survivors always hold the best score, so only they need to be scanned
+    alive = dino.alive_indices()
+    while len(alive) and dino.dino_score[alive].max() < DINO_MAX_SCORE:
+        print(f"Dino Score: {dino.dino_score[alive].max()}", end="\r")
+        if quiet:
+            # Nothing changes before the next spawn; the skipped frames still count as steps
+            step += dino.fast_forward() - 1
+            quiet = False
+        else:
+            dino.update()
+
+        alive = dino.alive_indices()
+        if not len(alive):
+            break
+        if step % decision_interval == 0:
+            inputs = dino_observations.observe_world(dino, alive, observations)
+            jump[alive], duck[alive] = policy.decide(inputs, alive)
+
+            if reference is not None and frame % AGREEMENT_SAMPLE_INTERVAL == 0:
+                agreement.append(decision_agreement(reference, policy.full_policy, inputs, rows=alive))
+            frame += 1
+            changed = dino.act(jump, duck)
+            quiet = fast_forward and not changed and dino.is_quiescent()
+        elif hold_actions:
+            dino.act(jump, duck)
+        step += 1
 
-            scores[i] = dino.score * 100
+    report_agreement("Dino", precision, agreement)
+    return dino_fitness(dino.dino_score)
 
-    return scores
+def evaluate_lockstep(population, precision=INFERENCE_PRECISION, flappy_seed=None, dino_seed=None,
+                      flappy_track=None, dino_track=None, decision_interval=DECISION_INTERVAL, hold_actions=HOLD_ACTIONS,
+                      fast_forward=DINO_FAST_FORWARD):
+    """
+    Plays Flappy and Dino side by side. Each frame the observations of the
+    surviving birds and dinos form one mixed batch, which a MultiTaskPolicy
+    evaluates with a single shared hidden-layer pass. The policy is compacted
+    to the survivors of both games like the per-game ones, so weights are only
+    gathered when the block shrinks, not every frame.
 
-def multi_train(generations=1000):
-    pygame.init()
-    pygame.display.set_mode((1, 1))
-    bird_sprite = pygame.image.load(flappy_config.BIRD_SPRITE).convert_alpha()
-    pipe_sprite = pygame.image.load(flappy_config.PIPE_SPRITE).convert_alpha()
+    :param flappy_seed: Flappy level seed, as in evaluate_on_flappy
+    :param dino_seed: Dino level seed, as in evaluate_on_dino
+    :param flappy_track: Precomputed Flappy track; replaces flappy_seed if given
+    :param dino_track: Precomputed Dino track; replaces dino_seed if given
+    :param decision_interval: Frames between network evaluations, as in evaluate_on_flappy
+    :param hold_actions: Repeat the last actions between decisions
+    :param fast_forward: Leave dinos out of inference while the Dino world is quiescent
+    :return: Combined fitness (Flappy + Dino) per agent
+    """
+    num_agents = len(population)
+    flappy = restart(reusable(("flappy", num_agents), lambda: FlappyWorld(num_agents=num_agents)), flappy_seed, flappy_track)
+    dino = restart(reusable(("dino", num_agents), lambda: DinoWorld(num_agents=num_agents)), dino_seed, dino_track)
+    network = PopulationNetwork.from_population(population)
+    policy = compacting(network, "multi", precision)
+    reference = compiled(network, "multi", "float64") if precision != "float64" else None
+    # Flappy rows first, Dino rows right after, so the batch needs no concatenation
+    observations = reusable(("lockstep observations", num_agents), lambda: flappy_observations.allocate(2 * num_agents))
+    flappy_jump = np.zeros(num_agents, dtype=bool)  # Entries of dead agents are ignored
+    dino_jump = np.zeros(num_agents, dtype=bool)
+    duck = np.zeros(num_agents, dtype=bool)
+    agreement = []
+    frame = 0
+    step = 0
+    dino_quiet = False
 
-    agents = [Agent(INPUT_SIZE) for _ in range(NUM_AGENTS)]
-    generation = 1
+    empty = np.array([], dtype=int)
+    dino_alive = dino.alive_indices()
+    while True:
+        flappy_running = flappy.alive and flappy.score < FLAPPY_MAX_SCORE
+        dino_running = len(dino_alive) > 0 and dino.dino_score[dino_alive].max() < DINO_MAX_SCORE
+        if not flappy_running and not dino_running:
+            break
 
-    while generation <= generations:
-        print(f"\n=== Generation {generation} ===")
+        if flappy_running:
+            print(f"Flappy Score: {flappy.score}", end="\r")
+        if dino_running:
+            dino.update()
+            dino_alive = dino.alive_indices()
+            dino_quiet = dino_quiet and dino.num_obstacles == 0
+        else:
+            dino_alive = empty
+        # Quiet dinos would repeat their last decision; Flappy still steps every frame
+        dino_rows = empty if dino_quiet else dino_alive
 
-        # Evaluate on both games
-        print("Evaluating on Flappy...")
-        flappy_scores = evaluate_on_flappy(agents, bird_sprite, pipe_sprite)
-        print("Evaluating on Dino...")
-        dino_scores = evaluate_on_dino(agents)
+        if step % decision_interval == 0:
+            flappy_alive = flappy.alive_indices() if flappy_running else empty
+            split = len(flappy_alive)
+            flappy_observations.observe_world(flappy, flappy_alive, observations)
+            dino_observations.observe_world(dino, dino_rows, observations[split:])
 
-        # Combine fitness
-        combined = [f + d for f, d in zip(flappy_scores, dino_scores)]
+            if split or len(dino_rows):
+                # One inference call for both games; Flappy rows come first, Dino
+                # rows are numbered after them in the policy's block
+                inputs = observations[:split + len(dino_rows)]
+                keys = np.concatenate([flappy_alive, dino_rows + num_agents])
+                survivors = np.concatenate([flappy_alive, dino_alive + num_agents])
+                flappy_jumps, dino_jumps, ducks = policy.decide(inputs, keys, survivors)
+                flappy_jump[flappy_alive] = flappy_jumps[:split]
+                dino_jump[dino_rows], duck[dino_rows] = dino_jumps[split:], ducks[split:]
 
-        # Save best
-        best_index = max(range(NUM_AGENTS), key=lambda i: combined[i])
-        save_best_agent(agents[best_index], combined[best_index], generation, save_path=MODEL_SAVE_PATH)
+                if reference is not None and frame % AGREEMENT_SAMPLE_INTERVAL == 0:
+                    rows = np.concatenate([flappy_alive, dino_rows])
+                    agreement.append(decision_agreement(reference, policy.full_policy, inputs, rows))
+                frame += 1
+            decided = True
+        else:
+            decided = False
+            if not hold_actions:
+                flappy_jump[:] = False
+
+        if flappy_running:
+            flappy.update(flappy_jump)
+        if len(dino_rows) and (decided or hold_actions):
+            changed = dino.act(dino_jump, duck)
+            dino_quiet = decided and fast_forward and not changed and dino.is_quiescent()
+        step += 1
+
+    report_agreement("Multi-task", precision, agreement)
+    return flappy_fitness(flappy.bird_score, flappy.bird_time_alive) + dino_fitness(dino.dino_score)
+
+def multi_train(generations=1000, num_agents=NUM_AGENTS, genome_path=GENOME_MMAP_PATH, chunk_size=EVAL_CHUNK_SIZE,
+                genome_dtype=GENOME_DTYPE, precision=INFERENCE_PRECISION, run_seed=RUN_SEED,
+                decision_interval=DECISION_INTERVAL, hold_actions=HOLD_ACTIONS, num_workers=NUM_WORKERS):
+    """
+    Trains a population on Flappy and Dino with combined fitness.
+
+    :param num_agents: Population size
+    :param genome_path: If set, genomes live in memory-mapped files (genome_path and
+                        a ".next" twin used as the offspring buffer) instead of RAM
+    :param chunk_size: Max agents simulated at once; each generation all chunks face the same levels
+    :param genome_dtype: Gene storage type ("float64", "float32" or "float16")
+    :param precision: Compiled policy precision ("float64", "float32", "float16" or "int8")
+    :param run_seed: Root seed; the same seed reproduces the whole run
+    :param decision_interval: Frames between network evaluations (see DECISION_INTERVAL)
+    :param hold_actions: Repeat the last action between decisions
+    :param num_workers: Worker processes sharing the evaluation (see NUM_WORKERS)
+    """
+    layout = GenomeLayout(INPUT_SIZE)
+    genome_rng = derive_rng(run_seed, "genomes")
+    if genome_path:
+        population = Population.create_memmap(genome_path, num_agents, layout, chunk_size=chunk_size, dtype=genome_dtype, rng=genome_rng)
+        offspring = Population.create_memmap(genome_path + ".next", num_agents, layout, randomize=False, dtype=genome_dtype)
+    else:
+        population = Population.random(num_agents, layout, dtype=genome_dtype, rng=genome_rng)
+        offspring = Population(np.empty_like(population.genomes), layout)
+    # Workers read the genomes in place; the GA keeps writing into the same two buffers
+    with ParallelEvaluator(num_workers) as evaluator:
+        population, offspring = evaluator.share(population), evaluator.share(offspring)
+        print(population.memory_report())
+        tracks = TrackLibrary(TRACK_LIBRARY_PATH)
+        generation = 1
+
+        while generation <= generations:
+            print(f"\n=== Generation {generation} ===")
+
+            # One level per game and generation, shared by every chunk
+            flappy_seed = episode_seed(run_seed, "flappy", generation)
+            dino_seed = episode_seed(run_seed, "dino", generation)
+            flappy_track = tracks.get("flappy", flappy_seed, FLAPPY_MAX_SCORE)
+            dino_track = tracks.get("dino", dino_seed, DINO_MAX_SCORE)
+
+            # Evaluate on both games and combine fitness
+            print("Evaluating on Flappy and Dino...")
+            # Lockstep returns the combined fitness as a single evaluation
+            if LOCKSTEP_EVALUATION:
+                evaluates = {
+                    "Flappy + Dino": partial(evaluate_lockstep, precision=precision, flappy_track=flappy_track, dino_track=dino_track,
+                                             decision_interval=decision_interval, hold_actions=hold_actions),
+                }
+            else:
+                evaluates = {
+                    "Flappy": partial(evaluate_on_flappy, precision=precision, track=flappy_track,
+                                      decision_interval=decision_interval, hold_actions=hold_actions),
+                    "Dino": partial(evaluate_on_dino, precision=precision, track=dino_track,
+                                    decision_interval=decision_interval, hold_actions=hold_actions),
+                }
+            scores, timings = evaluator.evaluate_concurrently(population, evaluates, chunk_size)
+            report_timings(timings)
+            combined = sum(scores.values())
 
-        # Evolve
-        agents = evolve_agents(agents, combined)
+            # Save best
+            best_index = int(np.argmax(combined))
+            save_best_agent(population.agent(best_index), float(combined[best_index]), generation, save_path=MODEL_SAVE_PATH)
 
-        print(f"Best Fitness: {combined[best_index]:.2f}")
-        generation += 1
+            # Evolve into the spare genome buffer (a file when out-of-core), then swap
+            ga_rng = derive_rng(run_seed, "ga", generation)
+            population, offspring = evolve_population(population, combined, out=offspring, chunk_size=GA_CHUNK_SIZE, rng=ga_rng), population
+            population.flush()
 
-    pygame.quit()
+            print(f"Best Fitness: {combined[best_index]:.2f}")
+            generation += 1
 
 if __name__ == "__main__":
     multi_train()
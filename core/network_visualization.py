@@ -10,14 +10,11 @@ def draw_network_visualization(screen, activations, max_display_hidden=16, input
     bottom_padding = 50
     layer_horizontal_margin = 100
 
-    # Extract activations
-    input_vals = activations['input']
-    hidden_vals = activations['hidden']
-    output_vals = activations['output']
-    w1 = activations['w1']
-    w_output = activations['w_output']
+    # Extract activations: input, each hidden layer, output
+    layer_vals = activations['layers']
+    weights = activations['weights']
 
-    num_layers = 3
+    num_layers = len(layer_vals)
     total_layer_width = screen_width - 2 * layer_horizontal_margin
     layer_spacing = total_layer_width // (num_layers - 1)
     x_positions = [layer_horizontal_margin + i * layer_spacing for i in range(num_layers)]
@@ -33,13 +30,17 @@ def draw_network_visualization(screen, activations, max_display_hidden=16, input
         step = len(values) / max_display
         return [(int(i * step), values[int(i * step)]) for i in range(max_display)]
 
-    # Sample hidden neurons
-    sampled_hidden = sample_layer(hidden_vals, max_display_hidden)
-    hidden_indices, hidden_sample_vals = zip(*sampled_hidden) if sampled_hidden else ([], [])
+    # Sample hidden neurons; input and output layers are always drawn in full
+    layer_indices = []
+    layer_samples = []
+    for k, values in enumerate(layer_vals):
+        is_hidden = 0 < k < num_layers - 1
+        sampled = sample_layer(values, max_display_hidden) if is_hidden else list(enumerate(values))
+        indices, sample_vals = zip(*sampled) if sampled else ([], [])
+        layer_indices.append(list(indices))
+        layer_samples.append(list(sample_vals))
 
-    y_input = get_y_positions(len(input_vals))
-    y_hidden = get_y_positions(len(hidden_sample_vals))
-    y_output = get_y_positions(len(output_vals))
+    y_layers = [get_y_positions(len(values)) for values in layer_samples]
 
     # Draw connection lines
     def draw_connections(from_vals, to_vals, weights, x_from, x_to, y_from, y_to, from_indices=None, to_indices=None):
@@ -65,25 +66,22 @@ def draw_network_visualization(screen, activations, max_display_hidden=16, input
             if labels and i < len(labels):
                 label_surface = font.render(labels[i], True, (0, 0, 0))
                 screen.blit(label_surface, (x - node_radius - 70, y_positions[i] - 7))
-    # Connections: input → sampled hidden
-    draw_connections(
-        input_vals, hidden_sample_vals, w1,
-        x_positions[0], x_positions[1],
-        y_input, y_hidden,
-        from_indices=range(len(input_vals)),
-        to_indices=hidden_indices
-    )
-
-    # Connections: sampled hidden → output
-    draw_connections(
-        hidden_sample_vals, output_vals, w_output,
-        x_positions[1], x_positions[2],
-        y_hidden, y_output,
-        from_indices=hidden_indices,
-        to_indices=None  # outputs aren't sampled
-    )
+    # Connections between consecutive layers
+    for k in range(num_layers - 1):
+        draw_connections(
+            layer_samples[k], layer_samples[k + 1], weights[k],
+            x_positions[k], x_positions[k + 1],
+            y_layers[k], y_layers[k + 1],
+            from_indices=layer_indices[k],
+            to_indices=layer_indices[k + 1]
+        )
 
     # Draw neurons
-    draw_layer(input_vals, x_positions[0], y_input, labels=input_labels)
-    draw_layer(hidden_sample_vals, x_positions[1], y_hidden, labels=None)
-    draw_layer(output_vals, x_positions[2], y_output, labels=output_labels)
\ No newline at end of file
+    for k in range(num_layers):
+        if k == 0:
+            labels = input_labels
+        elif k == num_layers - 1:
+            labels = output_labels
+        else:
+            labels = None
+        draw_layer(layer_samples[k], x_positions[k], y_layers[k], labels=labels)
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+population.py
+
+Defines the Population class, a compact array-backed store for a whole
+generation of agents. All genomes live in one contiguous (num_agents, genome_size)
+matrix and share a single GenomeLayout. Agent objects are only created on demand,
+as lightweight views onto one row of the matrix.
+
+Genes can be stored as float64, float32 or float16 to trade precision for
+memory and bandwidth. For populations that do not fit in RAM the matrix can be a memory-mapped .npy
+file (see create_memmap/open_memmap); it is then read and written in chunks.
+
+For worker processes the matrix can live in shared memory (see to_shared).
+Shared and memory-mapped populations pickle without their genes: a worker
+attaches to the same block or reopens the same file, so no rows are copied.
+"""
+import os
+import numpy as np
+from core.agent import Agent, GenomeLayout
+from core.shared import SharedArray
+
+
+class Population:
+    """
+    Contiguous genome matrix plus a shared layout descriptor.
+    """
+
+    def __init__(self, genomes: np.ndarray, layout: GenomeLayout):
+        """
+        :param genomes: (num_agents, genome_size) matrix, one genome per row
+        :param layout: Genome layout shared by all agents
+        """
+        if genomes.ndim != 2 or genomes.shape[1] != layout.genome_size:
+            raise ValueError(
+                f"Genome matrix shape {genomes.shape} does not match genome size {layout.genome_size}"
+            )
+        self.genomes = genomes if isinstance(genomes, np.memmap) else np.ascontiguousarray(genomes)
+        self.layout = layout
+        self.shared = None  # SharedArray holding the genomes, see to_shared
+
+    @classmethod
+    def random(cls, num_agents: int, layout: GenomeLayout, dtype=np.float64, rng: np.random.Generator | None = None) -> "Population":
+        """
+        Creates a population of uniformly initialized genomes.
+
+        :param dtype: Gene storage type (float64, float32 or float16)
+        :param rng: Generator to draw from; a fresh unseeded one if None
+        """
+        return cls(layout.random_genomes(num_agents, dtype, rng), layout)
+
+    @classmethod
+    def create_memmap(cls, path: str, num_agents: int, layout: GenomeLayout, randomize: bool = True, chunk_size: int = 10000, dtype=np.float64, rng: np.random.Generator | None = None) -> "Population":
+        """
+        Creates a population backed by a memory-mapped .npy file.
+
+        :param path: File to create (overwritten if it exists)
+        :param randomize: Fill with uniformly initialized genomes; otherwise left zeroed
+        :param chunk_size: Rows initialized per step, bounds memory use
+        :param dtype: Gene storage type (float64, float32 or float16)
+        :param rng: Generator to draw from; a fresh unseeded one if None
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        genomes = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(num_agents, layout.genome_size))
+        if randomize:
+            for start in range(0, num_agents, chunk_size):
+                stop = min(start + chunk_size, num_agents)
+                genomes[start:stop] = layout.random_genomes(stop - start, dtype, rng)
+        return cls(genomes, layout)
+
+    @classmethod
+    def open_memmap(cls, path: str, layout: GenomeLayout, mode: str = "r+") -> "Population":
+        """
+        Opens an existing memory-mapped population file.
+        """
+        return cls(np.load(path, mmap_mode=mode), layout)
+
+    @classmethod
+    def from_agents(cls, agents: list[Agent]) -> "Population":
+        """
+        Packs a list of agents into a population (genomes are copied).
+        """
+        return cls(np.stack([agent.genome for agent in agents]), agents[0].layout)
+
+    def to_shared(self) -> "Population":
+        """
+        Copies the population into a new shared-memory block. The caller owns
+        the block and unlinks it (population.shared.unlink()) when done.
+        """
+        shared = SharedArray(self.genomes.shape, self.genomes.dtype)
+        shared.array[:] = self.genomes
+        population = Population(shared.array, self.layout)
+        population.shared = shared
+        return population
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.shared is not None:
+            del state["genomes"]  # Reattached from the shared block
+        elif isinstance(self.genomes, np.memmap):
+            state["genomes"] = self.genomes.filename  # Reopened read-only
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.shared is not None:
+            self.genomes = self.shared.array
+        elif isinstance(self.genomes, str):
+            self.genomes = np.load(self.genomes, mmap_mode="r")
+
+    def __len__(self):
+        return self.genomes.shape[0]
+
+    def chunk(self, start: int, stop: int) -> "Population":
+        """
+        Rows [start, stop) as an in-memory population. Memory-mapped rows are
+        loaded into RAM; otherwise the chunk is a view onto the genome matrix.
+        """
+        genomes = self.genomes[start:stop]
+        if isinstance(genomes, np.memmap):
+            genomes = np.array(genomes)
+        return Population(genomes, self.layout)
+
+    def flush(self):
+        """
+        Writes pending changes of a memory-mapped population to disk.
+        """
+        if isinstance(self.genomes, np.memmap):
+            self.genomes.flush()
+
+    def agent(self, index: int) -> Agent:
+        """
+        Returns a lightweight Agent view onto one row. Changes to the agent's
+        genome are written straight into the population matrix.
+        """
+        return Agent(None, genome=self.genomes[index], layout=self.layout)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total bytes held by the genome matrix.
+        """
+        return self.genomes.nbytes
+
+    @property
+    def bytes_per_agent(self) -> int:
+        """
+        Bytes of genome storage per agent.
+        """
+        return self.layout.genome_size * self.genomes.itemsize
+
+    def memory_report(self) -> str:
+        """
+        Human-readable summary used to size training runs.
+        """
+        return (
+            f"Population: {len(self)} agents x {self.layout.genome_size} genes "
+            f"({self.genomes.dtype}), {self.bytes_per_agent} B/agent, "
+            f"{self.nbytes / 1024 ** 2:.1f} MiB total"
+        )
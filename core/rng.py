@@ -0,0 +1,34 @@
+"""
+rng.py
+
+Reproducible random number streams. Every source of randomness (genome
+initialization, the GA, each game's level generation) draws from its own
+numpy.random.Generator derived from (run seed, stream, generation, episode)
+through a SeedSequence, so any evaluation can be replayed bit for bit in any
+process, independently of what other streams have consumed.
+"""
+import numpy as np
+
+# Stream identifiers mixed into the seed
+STREAMS = {
+    "genomes": 0,   # Initial population
+    "ga": 1,        # Parent selection and mutation
+    "flappy": 2,    # Flappy levels
+    "dino": 3,      # Dino levels
+}
+
+
+def episode_seed(run_seed: int, stream: str, generation: int = 0, episode: int = 0) -> list[int]:
+    """
+    Seed entropy for one stream of one episode; can be passed to np.random.default_rng.
+
+    :param stream: Key of STREAMS
+    """
+    return [run_seed, STREAMS[stream], generation, episode]
+
+
+def derive_rng(run_seed: int, stream: str, generation: int = 0, episode: int = 0) -> np.random.Generator:
+    """
+    :return: Independent generator for one stream of one episode
+    """
+    return np.random.default_rng(episode_seed(run_seed, stream, generation, episode))
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""
+shared.py
+
+Named shared-memory arrays for handing large buffers to worker processes
+without copying. A SharedArray pickles as a small handle (block name, shape
+and dtype): the receiving process attaches to the same memory instead of
+unpickling a copy of the data, and keeps the attachment for later messages,
+so after the first generation only the handle crosses the process boundary.
+When a process attaches to a new block, it first releases its attachments to
+blocks that were unlinked meanwhile (e.g. a results block that was replaced),
+so they do not stay mapped for the life of the worker.
+"""
+from multiprocessing import shared_memory
+import numpy as np
+
+# Blocks this process attached to, by name
+attached = {}
+
+
+class SharedArray:
+    """
+    A numpy array over a multiprocessing.shared_memory block.
+    """
+
+    def __init__(self, shape, dtype=np.float64):
+        """
+        Creates a new, zero-filled block. The creating process owns it and must
+        call unlink() once it is no longer needed.
+
+        :param shape: Array shape (an int for a vector)
+        :param dtype: Array element type
+        """
+        self.shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        self.dtype = np.dtype(dtype)
+        size = max(int(np.prod(self.shape)) * self.dtype.itemsize, 1)
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.array = np.ndarray(self.shape, self.dtype, buffer=self.shm.buf)
+        self.array.fill(0)
+
+    @classmethod
+    def attach(cls, name: str, shape: tuple, dtype: str) -> "SharedArray":
+        """
+        Opens an existing block created by another process; repeated calls for
+        the same block reuse the first attachment.
+        """
+        shared = attached.get(name)
+        if shared is None:
+            release_unlinked()
+            shared = cls.__new__(cls)
+            shared.shape = shape
+            shared.dtype = np.dtype(dtype)
+            shared.shm = shared_memory.SharedMemory(name=name)
+            shared.array = np.ndarray(shape, shared.dtype, buffer=shared.shm.buf)
+            attached[name] = shared
+        return shared
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def nbytes(self) -> int:
+        return self.array.nbytes
+
+    def __reduce__(self):
+        return SharedArray.attach, (self.name, self.shape, self.dtype.str)
+
+    def close(self):
+        """
+        Unmaps the block from this process. Views of the array still held
+        elsewhere (e.g. by a Population) keep the mapping until they are gone.
+        """
+        self.array = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # Unmapped once the remaining views are collected
+
+    def unlink(self):
+        """
+        Unmaps and destroys the block. Other processes still mapping it keep
+        their memory until they release it, but no new process can attach.
+        """
+        self.close()
+        self.shm.unlink()
+
+
+def release_unlinked():
+    """
+    Closes and forgets this process's attachments to blocks that their owner
+    has unlinked since.
+    """
+    for name in list(attached):
+        try:
+            shared_memory.SharedMemory(name=name).close()
+        except FileNotFoundError:
+            attached.pop(name).close()
\ No newline at end of file
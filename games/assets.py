@@ -0,0 +1,78 @@
+"""
+assets.py
+
+Process-wide sprite cache. Every image is decoded and converted once, and every
+frame is cut out of its sprite sheet and scaled once; renderers, visualizers and
+experiments all share references to the same surfaces. Drawing 2000 birds
+therefore blits one set of frames instead of holding 2000 copies.
+
+Images are converted for the current display, so the cache must be used after
+pygame.display.set_mode. Call clear() if the display format changes.
+"""
+from functools import lru_cache
+import pygame
+
+# Max stretched variants kept by stretched(); only the pipes on screen need one
+STRETCH_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=None)
+def image(path: str, alpha: bool = True) -> pygame.Surface:
+    """
+    Loads and converts an image once.
+
+    :param alpha: Keep per-pixel transparency (convert_alpha) or not (convert)
+    """
+    surface = pygame.image.load(path)
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+@lru_cache(maxsize=None)
+def scaled(path: str, size: tuple, alpha: bool = True) -> pygame.Surface:
+    """
+    Loads an image once and scales it to size, e.g. a background.
+    """
+    return pygame.transform.scale(image(path, alpha), size)
+
+
+@lru_cache(maxsize=None)
+def region(path: str, rect: tuple) -> pygame.Surface:
+    """
+    Cuts the (left, top, width, height) rect out of a sprite sheet.
+    """
+    return image(path).subsurface(pygame.Rect(rect)).copy()
+
+
+@lru_cache(maxsize=None)
+def frames(path: str, cell_size: tuple, indices: tuple, size: tuple) -> tuple:
+    """
+    Cuts frames out of a one-row sprite sheet and scales them.
+
+    :param cell_size: (width, height) of one frame in the sheet
+    :param indices: Column of each frame, in animation order
+    :param size: Target (width, height) of every frame
+    :return: Tuple of shared frame surfaces
+    """
+    width, height = cell_size
+    sheet = image(path)
+    return tuple(
+        pygame.transform.scale(sheet.subsurface(pygame.Rect(i * width, 0, width, height)), size)
+        for i in indices
+    )
+
+
+@lru_cache(maxsize=STRETCH_CACHE_SIZE)
+def stretched(path: str, rect: tuple, size: tuple) -> pygame.Surface:
+    """
+    A sprite sheet region stretched to size, e.g. a pipe of a given height.
+    Bounded, since sizes vary from object to object.
+    """
+    return pygame.transform.scale(region(path, rect), size)
+
+
+def clear():
+    """
+    Drops every cached surface.
+    """
+    for cached in (image, scaled, region, frames, stretched):
+        cached.cache_clear()
\ No newline at end of file
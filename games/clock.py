@@ -0,0 +1,74 @@
+"""
+clock.py
+
+Time sources for the game cores. Every timing rule of the games (pipe and
+obstacle spawning, the speed ramp) reads milliseconds from a clock that the
+core advances once per update.
+
+- SimulationClock advances by a fixed 1000 / fps ms per frame, so timing is
+  expressed in frames: uncapped headless training produces exactly the same
+  levels as 60 FPS play, and a slow frame no longer changes the level.
+- WallClock follows real time, like pygame.time.get_ticks() did.
+"""
+import time
+
+
+class SimulationClock:
+    """
+    Fixed-timestep clock: ticks() only changes when tick() is called.
+    """
+
+    def __init__(self, fps: int = 60):
+        """
+        :param fps: Simulated frames per second
+        """
+        self.fps = fps
+        self.frame = 0
+
+    def reset(self):
+        """
+        Restarts the clock at 0 ms.
+        """
+        self.frame = 0
+
+    def tick(self, frames: int = 1):
+        """
+        Advances the clock by one frame, or by the given number of frames.
+        """
+        self.frame += frames
+
+    def ticks(self) -> int:
+        """
+        :return: Simulated milliseconds since start, as an int
+        """
+        return self.frame * 1000 // self.fps
+
+    def first_frame_after(self, ms: int) -> int:
+        """
+        :return: First frame at which ticks() exceeds ms
+        """
+        return -(-(ms + 1) * self.fps // 1000)
+
+
+class WallClock:
+    """
+    Real-time clock; tick() is a no-op.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+
+    def reset(self):
+        """
+        Restarts the clock at 0 ms.
+        """
+        self.start = time.perf_counter()
+
+    def tick(self):
+        pass
+
+    def ticks(self) -> int:
+        """
+        :return: Milliseconds since the clock was created, as an int
+        """
+        return int((time.perf_counter() - self.start) * 1000)
\ No newline at end of file
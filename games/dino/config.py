@@ -18,13 +18,23 @@ BASE_SPEED = 6.0
 MIN_OBSTACLE_DELAY = 600    # ms
 MAX_OBSTACLE_DELAY = 1500   # ms
 
+DINO_RUN_FRAMES = list(range(1, 11))
 DINO_DUCK_FRAMES = list(range(19, 24))
+DINO_SHEET_COLUMNS = 24
+
+# Entity sizes in pixels (width, height). The simulation uses these instead of
+# the loaded sprites; the renderer scales the sprites to the same sizes.
+DINO_RUN_SIZE = (60, 60)            # 24x24 sheet frame scaled by 2.5
+DINO_DUCK_SIZE = (60, 36)           # same frame, 0.6 of the running height
+CACTUS_SIZE = (35, 41)
+FLYING_OBSTACLE_SIZE = (32, 30)     # 16x15 sheet frame scaled by 2
+FLYING_OBSTACLE_FRAMES = 8
 
 ASSETS_PATH = os.path.join(os.path.dirname(__file__), "assets")
 
 DINO_SPRITESHEET = os.path.join(ASSETS_PATH, "dino_spritesheet.png")
 CACTUS_SPRITE = os.path.join(ASSETS_PATH, "cactus.png")
-BIRD_SPRITE = os.path.join(ASSETS_PATH, "bird.png")
+BIRD_SPRITE = os.path.join(ASSETS_PATH, "Bird.png")
 BACKGROUND_IMAGE = os.path.join(ASSETS_PATH, "background.jpg")
 
 # Training parameters
@@ -32,3 +42,16 @@ NUM_AGENTS = 1000
 INPUT_SIZE = 10
 
 SAVE_MODEL_PATH = "model/dino_best.pkl"
+
+# Watch mode: run the network every DECISION_INTERVAL frames; in between,
+# HOLD_ACTIONS repeats the last action, otherwise no input is given
+DECISION_INTERVAL = 1
+HOLD_ACTIONS = False
+
+# Parallel training: with NUM_WORKERS > 1 the visual trainer scores each
+# generation headless across that many worker processes, on a level seeded
+# from RUN_SEED, and the window replays that level for the DISPLAY_AGENTS
+# fittest agents only
+NUM_WORKERS = 1
+DISPLAY_AGENTS = 50
+RUN_SEED = 0
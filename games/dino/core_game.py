@@ -1,5 +1,6 @@
-import pygame
-import random
+from collections import deque
+import numpy as np
+from games.clock import SimulationClock
 import games.dino.config as config
 from games.dino.dino import Dino
 from games.dino.obstacles import Obstacle, FlyingObstacle
@@ -10,49 +11,98 @@ class DinoCore:
     Core game logic shared between interactive play and agent training.
     """
 
-    def __init__(self):
+    def __init__(self, clock=None, rng=None, track=None):
+        """
+        :param clock: Time source advanced once per update; a SimulationClock at config.FPS if None
+        :param rng: numpy Generator for obstacle types and spawn delays; a fresh unseeded one if None
+        :param track: Precomputed level (see games.tracks); when given, obstacles are spawned
+                      from it instead of from the clock and rng
+        """
+        self.clock = clock if clock is not None else SimulationClock(config.FPS)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.track = track
         self.reset()
 
     def reset(self):
-        self.obstacles = []
-        self.last_spawn_time = pygame.time.get_ticks()
-        self.next_spawn_delay = random.randint(config.MIN_OBSTACLE_DELAY, config.MAX_OBSTACLE_DELAY)
+        self.obstacles = deque()  # Ordered by x, leftmost first
+        self.frame = 0
+        self.track_index = 0
+        self.last_spawn_time = self.clock.ticks()
+        self.next_spawn_delay = None if self.track is not None else self.spawn_delay()
         self.game_speed = config.BASE_SPEED
-        self.speed_timer = pygame.time.get_ticks()
-
-    def spawn_obstacle(self):
-        if self.obstacles and self.obstacles[-1].x > config.SCREEN_WIDTH - 200:
-            return
-        if random.random() < 0.7:  # 70% chance to spawn a cactus
-            self.obstacles.append(Obstacle(config.SCREEN_WIDTH, self.game_speed))
+        self.speed_timer = self.clock.ticks()
+
+    def spawn_delay(self):
+        """
+        :return: Random delay in ms until the next spawn attempt
+        """
+        return int(self.rng.integers(config.MIN_OBSTACLE_DELAY, config.MAX_OBSTACLE_DELAY, endpoint=True))
+
+    def spawn_obstacle(self, flying=None, speed=None):
+        """
+        Spawns an obstacle at the right edge, unless the previous one is still
+        too close. With flying/speed given (from a track) it always spawns.
+
+        :param flying: Obstacle type; drawn from rng if None
+        :param speed: Obstacle speed; the current game speed if None
+        """
+        if flying is None:
+            if self.obstacles and self.obstacles[-1].x > config.SCREEN_WIDTH - 200:
+                return
+            flying = not self.rng.random() < 0.7  # 70% chance to spawn a cactus
+        speed = speed if speed is not None else self.game_speed
+        obstacle = FlyingObstacle(config.SCREEN_WIDTH, speed) if flying else Obstacle(config.SCREEN_WIDTH, speed)
+        obstacle.passed_by = set()
+        self.obstacles.append(obstacle)
+
+    def spawn_from_track(self):
+        """
+        Spawns the obstacles the track schedules for the current frame.
+        """
+        track = self.track
+        while self.track_index < len(track) and track["frame"][self.track_index] == self.frame:
+            self.spawn_obstacle(bool(track["flying"][self.track_index]), float(track["speed"][self.track_index]))
+            self.track_index += 1
+
+
+    def update(self, dinos: list, active=None):
+        """
+        Advances obstacles and the given dinos by one frame.
+
+        :param active: Indices of the dinos that may still be alive; only these are
+                       stepped. None processes every dino.
+        """
+        self.clock.tick()
+        self.frame += 1
+        if self.track is not None:
+            self.spawn_from_track()
         else:
-            self.obstacles.append(FlyingObstacle(config.SCREEN_WIDTH, self.game_speed))
-
-
-    def update(self, dinos: list):
-        # Gradually increase speed
-        now = pygame.time.get_ticks()
-        if now - self.speed_timer > 3000:
-            self.game_speed += 0.1
-            self.game_speed = min(self.game_speed, 12)
-            self.speed_timer = now
-
-        # Obstacle spawning
-        now = pygame.time.get_ticks()
-        if now - self.last_spawn_time > self.next_spawn_delay:
-            self.spawn_obstacle()
-            self.last_spawn_time = now
-            self.next_spawn_delay = random.randint(config.MIN_OBSTACLE_DELAY, config.MAX_OBSTACLE_DELAY)
+            # Gradually increase speed
+            now = self.clock.ticks()
+            if now - self.speed_timer > 3000:
+                self.game_speed += 0.1
+                self.game_speed = min(self.game_speed, 12)
+                self.speed_timer = now
+
+            # Obstacle spawning
+            now = self.clock.ticks()
+            if now - self.last_spawn_time > self.next_spawn_delay:
+                self.spawn_obstacle()
+                self.last_spawn_time = now
+                self.next_spawn_delay = self.spawn_delay()
 
         # Update obstacles
         for obstacle in self.obstacles:
             obstacle.update()
 
         # Remove off-screen obstacles
-        self.obstacles = [o for o in self.obstacles if not o.is_off_screen()]
+        while self.obstacles and self.obstacles[0].is_off_screen():
+            self.obstacles.popleft()
 
         # Process each dino
-        for i, dino in enumerate(dinos):
+        candidates = {}  # Broadphase results by column, shared by the dinos this frame
+        for i in range(len(dinos)) if active is None else active:
+            dino = dinos[i]
             if not dino.alive:
                 continue
 
@@ -60,25 +110,61 @@ class DinoCore:
 
             # Track obstacles passed per dino
             for obs in self.obstacles:
-                if not hasattr(obs, 'passed_by'):
-                    obs.passed_by = set()
-
-                if i not in obs.passed_by and obs.x + obs.width < dino.x:
+                if obs.x + obs.width >= dino.x:
+                    break  # This and all later obstacles are still ahead
+                if i not in obs.passed_by:
                     obs.passed_by.add(i)
                     dino.score = getattr(dino, 'score', 0) + 1
 
             # Check for collision
-            dino_bounds = dino.get_bounds()
-            for obs in self.obstacles:
-                o_bounds = obs.get_bounds()
-                if (
-                    dino_bounds[2] > o_bounds[0] and dino_bounds[0] < o_bounds[2] and
-                    dino_bounds[3] > o_bounds[1] and dino_bounds[1] < o_bounds[3]
-                ):
-                    dino.alive = False
-
-    def get_next_obstacle(self):
+            bounds = dino.get_bounds()
+            column = (bounds[0], bounds[2])
+            if column not in candidates:
+                candidates[column] = self.obstacles_in_column(*column)
+            if self.check_collision(dino, candidates[column]):
+                dino.alive = False
+
+    def obstacles_in_column(self, left, right):
+        """
+        Broadphase: obstacles whose padded bounds horizontally overlap the column [left, right].
+        Obstacles keep the speed they spawned with and spawns are at least 200 px
+        apart, so the speed ramp never lets one overtake another and the deque
+        stays ordered by x.
+
+        :return: List of at most a couple of obstacles
+        """
+        candidates = []
+        for obs in self.obstacles:
+            o_left, _, o_right, _ = obs.get_bounds()
+            if o_left >= right:
+                break
+            if o_right > left:
+                candidates.append(obs)
+        return candidates
+
+    def check_collision(self, dino, candidates=None):
+        """
+        Padded box collision of one dino against the obstacles.
+
+        :param candidates: Obstacles overlapping the dino's column; looked up if None
+        """
+        dino_bounds = dino.get_bounds()
+        if candidates is None:
+            candidates = self.obstacles_in_column(dino_bounds[0], dino_bounds[2])
+        for obs in candidates:
+            o_bounds = obs.get_bounds()
+            if (
+                dino_bounds[2] > o_bounds[0] and dino_bounds[0] < o_bounds[2] and
+                dino_bounds[3] > o_bounds[1] and dino_bounds[1] < o_bounds[3]
+            ):
+                return True
+        return False
+
+    def get_next_obstacle(self, x=0):
+        """
+        :return: The leftmost obstacle whose right edge is still ahead of x, or None
+        """
         for obs in self.obstacles:
-            if obs.x + obs.width > 0:
+            if obs.x + obs.width > x:
                 return obs
         return None
\ No newline at end of file
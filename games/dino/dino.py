@@ -1,72 +1,56 @@
-import pygame
 import games.dino.config as config
 
 class Dino:
     """
     Represents the player-controlled dino character.
+    Holds only numeric state; sprites are drawn by games.dino.renderer.DinoRenderer.
     """
 
     def __init__(self, x, y):
         self.x = x
         self.y = y
+        self.frame_interval = 100  # ms
+        self.reset()
+
+    def reset(self):
+        """
+        Puts the dino back on the ground in its start state, in place, so dinos
+        can be reused across generations.
+        """
         self.velocity_y = 0
         self.on_ground = True
         self.alive = True
         self.is_ducking = False
         self.score = 0
 
-        # Load and split spritesheet
-        sheet = pygame.image.load(config.DINO_SPRITESHEET).convert_alpha()
-        frame_width = sheet.get_width() // 24
-        frame_height = sheet.get_height()
-        scale_factor = 2.5
-
-        # Running frames (1–10)
-        run_indices = list(range(1, 11))
-        self.run_frames = [
-            pygame.transform.scale(
-                sheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, frame_height)),
-                (int(frame_width * scale_factor), int(frame_height * scale_factor))
-            )
-            for i in run_indices
-        ]
-
-        # Ducking frames (13–17)
-        duck_indices = config.DINO_DUCK_FRAMES
-        self.duck_frames = [
-            pygame.transform.scale(
-                sheet.subsurface(pygame.Rect(i * frame_width, 0, frame_width, frame_height)),
-                (int(frame_width * scale_factor), int(frame_height * scale_factor * 0.6))  # scale shorter
-            )
-            for i in duck_indices
-        ]
-
-        self.frames = self.run_frames
+        # Animation state, frames are owned by the renderer
         self.current_frame = 0
         self.animation_timer = 0
-        self.frame_interval = 100  # ms
 
-        self.width = self.frames[0].get_width()
-        self.height = self.frames[0].get_height()
+        self.width, self.height = config.DINO_RUN_SIZE
         self.original_height = self.height
 
         self.y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - self.height
 
+    @property
+    def num_frames(self):
+        """
+        Number of animation frames of the current pose.
+        """
+        return len(config.DINO_DUCK_FRAMES if self.is_ducking else config.DINO_RUN_FRAMES)
 
     def duck(self):
         if not self.is_ducking:
             self.is_ducking = True
-            self.frames = self.duck_frames
             self.current_frame = 0
-            self.height = self.frames[0].get_height()
+            self.height = config.DINO_DUCK_SIZE[1]
             self.y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - self.height
 
     def stand_up(self):
         if self.is_ducking:
             self.is_ducking = False
-            self.frames = self.run_frames
             self.current_frame = 0
-            self.height = self.frames[0].get_height()
+            self.height = config.DINO_RUN_SIZE[1]
             self.y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - self.height
 
 
@@ -81,11 +65,11 @@ class Dino:
                 self.velocity_y = 0
                 self.on_ground = True
 
-        # Animation
-        self.animation_timer += pygame.time.get_ticks() % config.FPS
+        # Animation, advanced by one frame's worth of milliseconds
+        self.animation_timer += 1000 / config.FPS
         if self.animation_timer > self.frame_interval:
             self.animation_timer = 0
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
+            self.current_frame = (self.current_frame + 1) % self.num_frames
 
     def jump(self):
         if self.on_ground:
@@ -100,7 +84,4 @@ class Dino:
             self.y + padding_y,
             self.x + self.width - padding_x,
             self.y + self.height - padding_y
-        )
-
-    def draw(self, screen):
-        screen.blit(self.frames[self.current_frame], (self.x, self.y))
\ No newline at end of file
+        )
\ No newline at end of file
@@ -4,6 +4,7 @@ from games.dino.dino import Dino
 from games.dino.obstacles import Obstacle
 import games.dino.config as config
 from games.dino.core_game import DinoCore
+from games.dino.renderer import DinoRenderer
 
 class DinoGame:
     def __init__(self):
@@ -13,22 +14,15 @@ class DinoGame:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 24)
 
+        self.renderer = DinoRenderer()
         self.core = DinoCore()
         self.dino = Dino(50, config.SCREEN_HEIGHT - config.GROUND_HEIGHT - config.DINO_HEIGHT)
         self.running = True
 
     def draw(self):
         self.screen.fill((240, 240, 240))
-        pygame.draw.rect(
-            self.screen,
-            (100, 100, 100),
-            (0, config.SCREEN_HEIGHT - config.GROUND_HEIGHT, config.SCREEN_WIDTH, config.GROUND_HEIGHT)
-        )
-        # Obstacles and dino
-        for obs in self.core.obstacles:
-            obs.draw(self.screen)
-
-        self.dino.draw(self.screen)
+        # Ground, obstacles and dino
+        self.renderer.draw_world(self.screen, self.core, [self.dino], alive_only=False)
 
         # Score
         self.draw_text(f"Score: {getattr(self.dino, 'score', 0)}", 10, 10)
@@ -66,7 +60,7 @@ class DinoGame:
 
     def reset(self):
         self.core.reset()
-        self.dino = Dino(50, config.SCREEN_HEIGHT - config.GROUND_HEIGHT - config.DINO_HEIGHT)
+        self.dino.reset()
 
 
     def run(self):
@@ -0,0 +1,103 @@
+"""
+observations.py
+
+Batched Dino observations. Features of every requested dino are written into
+one preallocated (N x NUM_FEATURES) float buffer that is handed straight to
+batched inference. Terms that only depend on the next obstacle are computed
+once per frame and broadcast to all rows.
+
+Feature layout (shared with Flappy, see games.flappy.observations):
+    0 dino y, 1 vertical velocity, 2 distance to obstacle, 3 height difference,
+    4 obstacle height, 5 obstacle width, 6 obstacle speed, 7 time to collision,
+    8 is flying, 9 is ground obstacle, 10 one-hot Flappy, 11 one-hot Dino
+"""
+
+import numpy as np
+import games.dino.config as config
+from games.dino.obstacles import FlyingObstacle
+
+NUM_FEATURES = 12
+
+
+def allocate(capacity: int) -> np.ndarray:
+    """
+    :return: Observation buffer for up to `capacity` agents
+    """
+    return np.zeros((capacity, NUM_FEATURES))
+
+
+def observe_world(world, rows, out: np.ndarray) -> np.ndarray:
+    """
+    Observations of the given dinos of a DinoWorld.
+
+    :param rows: Dino indices, e.g. world.alive_indices()
+    :param out: Buffer with at least len(rows) rows
+    :return: View of the first len(rows) rows of out, one per dino
+    """
+    inputs = out[:len(rows)]
+    np.take(world.dino_y, rows, out=inputs[:, 0])
+    np.take(world.dino_velocity, rows, out=inputs[:, 1])
+
+    obstacle = world.next_obstacle()
+    if obstacle is None:
+        return finish(inputs, world.dino_x)
+    width, height, obstacle_y = (value[0] for value in world.obstacle_size([obstacle]))
+    return finish(
+        inputs, world.dino_x, world.obstacle_x[obstacle], obstacle_y,
+        width, height, world.obstacle_speed[obstacle], world.obstacle_flying[obstacle]
+    )
+
+
+def observe_dinos(dinos, rows, next_obstacle, out: np.ndarray) -> np.ndarray:
+    """
+    Observations of the given Dino objects.
+
+    :param rows: Dino indices
+    :param next_obstacle: Obstacle the dinos are heading for, or None
+    :param out: Buffer with at least len(rows) rows
+    :return: View of the first len(rows) rows of out, one per dino
+    """
+    inputs = out[:len(rows)]
+    for row, i in enumerate(rows):
+        inputs[row, 0] = dinos[i].y
+        inputs[row, 1] = dinos[i].velocity_y
+
+    dino_x = dinos[rows[0]].x if len(rows) else 0
+    if next_obstacle is None:
+        return finish(inputs, dino_x)
+    return finish(
+        inputs, dino_x, next_obstacle.x, next_obstacle.y, next_obstacle.width,
+        next_obstacle.height, next_obstacle.speed, isinstance(next_obstacle, FlyingObstacle)
+    )
+
+
+def finish(inputs: np.ndarray, dino_x, obstacle_x=None, obstacle_y=None, width=None, height=None, speed=None, flying=None) -> np.ndarray:
+    """
+    Completes rows whose columns 0 and 1 hold raw y and velocity: normalizes
+    them and fills in the obstacle terms, computed once for all rows.
+
+    :param obstacle_x: x of the next obstacle, or None if there is none
+    """
+    if obstacle_x is not None:
+        is_flying = float(flying)
+        dx = (obstacle_x - dino_x) / config.SCREEN_WIDTH
+        np.subtract(obstacle_y, inputs[:, 0], out=inputs[:, 3])
+        inputs[:, 3] /= config.SCREEN_HEIGHT
+        inputs[:, 2] = dx
+        inputs[:, 4] = height / config.SCREEN_HEIGHT
+        inputs[:, 5] = width / config.SCREEN_WIDTH
+        inputs[:, 6] = speed / config.BASE_SPEED
+        inputs[:, 7] = dx / (speed + 1e-5)                       # time to collision
+        inputs[:, 8] = is_flying
+        inputs[:, 9] = 1.0 - is_flying                           # is ground obstacle
+    else:
+        inputs[:, 2] = 1.0
+        inputs[:, 3:7] = 0.0
+        inputs[:, 7] = 1.0
+        inputs[:, 8:10] = 0.0
+
+    inputs[:, 0] /= config.SCREEN_HEIGHT
+    inputs[:, 1] /= 10.0
+    inputs[:, 10] = 0.0                                          # One-hot: not Flappy
+    inputs[:, 11] = 1.0                                          # One-hot: Dino
+    return inputs
\ No newline at end of file
@@ -1,5 +1,3 @@
-import pygame
-import random
 import games.dino.config as config
 
 class BaseObstacle:
@@ -23,15 +21,10 @@ class BaseObstacle:
             self.y + self.height - padding
         )
 
-    def draw(self, screen):
-        screen.blit(self.image, (self.x, self.y))
-
 class Obstacle(BaseObstacle):
     def __init__(self, x, speed):
         super().__init__(x, speed)
-        self.image = pygame.image.load(config.CACTUS_SPRITE).convert_alpha()
-        self.width = self.image.get_width()
-        self.height = self.image.get_height()
+        self.width, self.height = config.CACTUS_SIZE
         self.y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - self.height
 
     def update(self):
@@ -49,31 +42,14 @@ class Obstacle(BaseObstacle):
             self.y + self.height - padding
         )
 
-    def draw(self, screen):
-        screen.blit(self.image, (self.x, self.y))
-
 
 class FlyingObstacle(BaseObstacle):
     def __init__(self, x, speed):
         super().__init__(x, speed)
 
-        self.sprite_sheet = pygame.image.load(config.BIRD_SPRITE).convert_alpha()
-        frame_width, frame_height = 16, 15
-        scale_factor = 2
-
-        self.frames = []
-        for i in range(8):
-            frame = self.sprite_sheet.subsurface((i * frame_width, 0, frame_width, frame_height))
-            scaled_frame = pygame.transform.scale(
-                frame,
-                (frame_width * scale_factor, frame_height * scale_factor)
-            )
-            self.frames.append(scaled_frame)
-
+        # Animation frame index, frames are owned by the renderer
         self.image_index = 0
-        self.image = self.frames[self.image_index]
-        self.width = self.image.get_width()
-        self.height = self.image.get_height()
+        self.width, self.height = config.FLYING_OBSTACLE_SIZE
 
         self.y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT - 80
         self.animation_counter = 0
@@ -82,5 +58,4 @@ class FlyingObstacle(BaseObstacle):
         super().update()
         self.animation_counter += 1
         if self.animation_counter % 5 == 0:
-            self.image_index = (self.image_index + 1) % len(self.frames)
-            self.image = self.frames[self.image_index]
\ No newline at end of file
+            self.image_index = (self.image_index + 1) % config.FLYING_OBSTACLE_FRAMES
\ No newline at end of file
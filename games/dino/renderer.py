@@ -0,0 +1,89 @@
+"""
+renderer.py
+
+Defines the DinoRenderer class, which draws the headless Dino world with Pygame.
+The dino, cactus and flying obstacle frames come from the shared asset cache
+(games.assets), loaded and scaled once per process to the entity sizes used
+by the simulation (see config). Both the object-based DinoCore and the
+vectorized DinoWorld can be drawn; for the latter the animation frames follow
+the world's frame counter, as the arrays keep no animation state.
+"""
+
+import pygame
+from games import assets
+import games.dino.config as config
+from games.dino.obstacles import FlyingObstacle
+
+# Animation speeds, as in Dino (ms per frame) and FlyingObstacle (updates per frame)
+DINO_FRAME_MS = 100
+FLYING_FRAME_UPDATES = 5
+
+
+class DinoRenderer:
+    """
+    Draws the ground, obstacles and dinos using the shared Dino sprites.
+    """
+
+    def __init__(self):
+        sheet = assets.image(config.DINO_SPRITESHEET)
+        cell_size = (sheet.get_width() // config.DINO_SHEET_COLUMNS, sheet.get_height())
+        self.run_frames = assets.frames(config.DINO_SPRITESHEET, cell_size, tuple(config.DINO_RUN_FRAMES), config.DINO_RUN_SIZE)
+        self.duck_frames = assets.frames(config.DINO_SPRITESHEET, cell_size, tuple(config.DINO_DUCK_FRAMES), config.DINO_DUCK_SIZE)
+
+        self.cactus_image = assets.scaled(config.CACTUS_SPRITE, config.CACTUS_SIZE)
+
+        bird_sheet = assets.image(config.BIRD_SPRITE)
+        bird_cell_size = (bird_sheet.get_width() // config.FLYING_OBSTACLE_FRAMES, bird_sheet.get_height())
+        self.flying_frames = assets.frames(
+            config.BIRD_SPRITE, bird_cell_size, tuple(range(config.FLYING_OBSTACLE_FRAMES)), config.FLYING_OBSTACLE_SIZE
+        )
+
+    def draw_ground(self, surface):
+        pygame.draw.rect(
+            surface,
+            (100, 100, 100),
+            (0, config.SCREEN_HEIGHT - config.GROUND_HEIGHT, config.SCREEN_WIDTH, config.GROUND_HEIGHT)
+        )
+
+    def draw_dino(self, surface, dino):
+        frames = self.duck_frames if dino.is_ducking else self.run_frames
+        surface.blit(frames[dino.current_frame], (dino.x, dino.y))
+
+    def draw_obstacle(self, surface, obstacle):
+        if isinstance(obstacle, FlyingObstacle):
+            image = self.flying_frames[obstacle.image_index]
+        else:
+            image = self.cactus_image
+        surface.blit(image, (obstacle.x, obstacle.y))
+
+    def draw_world(self, surface, core, dinos, alive_only=True):
+        """
+        Draws the ground, every obstacle of a DinoCore and the given dinos.
+
+        :param alive_only: Skip dead dinos
+        """
+        self.draw_ground(surface)
+        for obstacle in core.obstacles:
+            self.draw_obstacle(surface, obstacle)
+        for dino in dinos:
+            if dino.alive or not alive_only:
+                self.draw_dino(surface, dino)
+
+    def draw_dino_world(self, surface, world, alive_only=True):
+        """
+        Draws the ground, every obstacle and the dinos of a DinoWorld.
+
+        :param alive_only: Skip dead dinos
+        """
+        self.draw_ground(surface)
+        n = world.num_obstacles
+        _, _, obstacle_y = world.obstacle_size(slice(0, n))
+        flying_image = self.flying_frames[world.frame // FLYING_FRAME_UPDATES % len(self.flying_frames)]
+        for x, y, flying in zip(world.obstacle_x[:n], obstacle_y, world.obstacle_flying[:n]):
+            surface.blit(flying_image if flying else self.cactus_image, (x, y))
+
+        step = world.frame * 1000 // config.FPS // DINO_FRAME_MS
+        rows = world.alive_indices() if alive_only else range(world.num_agents)
+        for i in rows:
+            frames = self.duck_frames if world.dino_ducking[i] else self.run_frames
+            surface.blit(frames[step % len(frames)], (world.dino_x, world.dino_y[i]))
\ No newline at end of file
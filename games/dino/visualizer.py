@@ -1,11 +1,21 @@
 import pygame
 import time
+from functools import partial
+import numpy as np
 import games.dino.config as dino_config
 from games.dino.dino import Dino
-from games.dino.obstacles import FlyingObstacle
 from games.dino.core_game import DinoCore
-from core.agent import Agent
-from core.ga import evolve_agents
+from games.dino.world import DinoWorld
+from games.dino.renderer import DinoRenderer
+from games.dino import observations
+from core.agent import GenomeLayout
+from core.inference import PopulationNetwork, CompactingPolicy
+from core.population import Population
+from core.ga import evolve_population
+from core.evaluation import ParallelEvaluator
+from core.rng import derive_rng, episode_seed
+from core.multi_train import evaluate_on_dino, dino_fitness, DINO_MAX_SCORE, EVAL_CHUNK_SIZE
+from games.tracks import TrackLibrary
 from core.model_utils import *
 
 from core.network_visualization import draw_network_visualization
@@ -17,146 +27,124 @@ class DinoVisualizer:
         pygame.display.set_caption("Dino Training Visualizer")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 24)
+        self.renderer = DinoRenderer()
 
         self.generation = 1
         self.start_time = time.time()
-        self.agents = []
-        self.core = DinoCore()
+        self.population = None
+
+        # With workers, fitness comes from headless evaluation and only the fittest agents are shown
+        self.evaluator = ParallelEvaluator(dino_config.NUM_WORKERS) if dino_config.NUM_WORKERS > 1 else None
+        self.tracks = TrackLibrary()
+        num_shown = min(dino_config.DISPLAY_AGENTS, dino_config.NUM_AGENTS) if self.evaluator is not None else dino_config.NUM_AGENTS
+        self.allocate_world(num_shown)
         self.reset_generation()
 
+    def allocate_world(self, num_agents):
+        """
+        Builds the vectorized world the shown dinos play in, with its observation
+        and decision buffers. It is reset in place for every generation.
+        """
+        self.world = DinoWorld(num_agents)
+        self.observations = observations.allocate(num_agents)
+        self.jump = np.zeros(num_agents, dtype=bool)  # Entries of dead dinos are ignored
+        self.duck = np.zeros(num_agents, dtype=bool)
+
     def reset_generation(self):
-        if self.agents:
-            fitness_scores = [self.scores[i] for i in range(dino_config.NUM_AGENTS)]
-            best_index = max(range(dino_config.NUM_AGENTS), key=lambda i: fitness_scores[i])
-            save_best_agent(self.agents[best_index], fitness_scores[best_index], self.generation, dino_config.SAVE_MODEL_PATH)
-            self.agents = evolve_agents(self.agents, fitness_scores)
+        """
+        Evolves the next generation and resets the world for it. Both modes select
+        on dino_fitness over the same seeded level, and the genomes and GA draw
+        from RUN_SEED, so training does not depend on NUM_WORKERS.
+        """
+        if self.population is not None:
+            if self.evaluator is None:
+                self.fitness = dino_fitness(self.world.dino_score)  # Scored like the workers do
+
+            # Save the plain score the fittest agent reached on screen
+            best_slot = int(np.argmax(self.fitness[self.shown]))
+            best_score = int(self.world.dino_score[best_slot])
+            save_best_agent(self.population.agent(int(self.shown[best_slot])), best_score, self.generation, dino_config.SAVE_MODEL_PATH)
+
+            ga_rng = derive_rng(dino_config.RUN_SEED, "ga", self.generation)
+            self.population, self.offspring = evolve_population(self.population, self.fitness, out=self.offspring, rng=ga_rng), self.population
         else:
-            self.agents = [Agent(dino_config.INPUT_SIZE) for _ in range(dino_config.NUM_AGENTS)]
-
-        self.core.reset()
-        self.dinos = [Dino(50, dino_config.SCREEN_HEIGHT - dino_config.GROUND_HEIGHT - dino_config.DINO_HEIGHT) for _ in range(dino_config.NUM_AGENTS)]
-        self.scores = [0 for _ in range(dino_config.NUM_AGENTS)]
-
-    def get_inputs(self, dino, obstacle):
-        if obstacle:
-            dx = (obstacle.x - dino.x) / dino_config.SCREEN_WIDTH
-            dy = (obstacle.y - dino.y) / dino_config.SCREEN_HEIGHT
-            obstacle_height = obstacle.height / dino_config.SCREEN_HEIGHT
-            obstacle_width = obstacle.width / dino_config.SCREEN_WIDTH
-            obstacle_speed = obstacle.speed / dino_config.BASE_SPEED
-            time_to_collision = dx / (obstacle.speed + 1e-5)
-            is_flying = 1.0 if isinstance(obstacle, FlyingObstacle) else 0.0
-            is_ground = 1.0 - is_flying
+            self.population = Population.random(dino_config.NUM_AGENTS, GenomeLayout(dino_config.INPUT_SIZE), rng=derive_rng(dino_config.RUN_SEED, "genomes"))
+            self.offspring = Population(np.empty_like(self.population.genomes), self.population.layout)  # Spare genome buffer for evolve_population
+            if self.evaluator is not None:
+                self.population, self.offspring = self.evaluator.share(self.population), self.evaluator.share(self.offspring)
+
+        seed = episode_seed(dino_config.RUN_SEED, "dino", self.generation)
+        self.world.track = self.tracks.get("dino", seed, DINO_MAX_SCORE)
+        if self.evaluator is not None:
+            self.evaluate_generation()
         else:
-            dx = 1.0
-            dy = 0.0
-            obstacle_height = 0.0
-            obstacle_width = 0.0
-            obstacle_speed = 0.0
-            time_to_collision = 1.0
-            is_flying = 0.0
-            is_ground = 0.0
-
-        return [
-            dino.y / dino_config.SCREEN_HEIGHT,
-            dino.velocity_y / 10.0,
-            dx,
-            dy,
-            obstacle_height,
-            obstacle_width,
-            obstacle_speed,
-            time_to_collision,
-            is_flying,
-            is_ground,
-            0.0, 1.0  # one-hot: Flappy, Dino
-        ]
-
-    def find_next_obstacle(self, core):
-        for obs in core.obstacles:
-            if obs.x + obs.width > core.dino.x:
-                return obs
-        return None
-    
-    def update(self):
-        self.core.update(self.dinos)  # Update shared obstacles
+            self.shown = np.arange(len(self.population))  # Population row of each dino
+            self.policy = CompactingPolicy(PopulationNetwork.from_population(self.population).compile_for("dino"))
+        self.reset_world()
 
-        next_obstacle = self.core.get_next_obstacle()
-        alive_count = 0
-        best_score = 0
-        best_index = -1
+    def evaluate_generation(self):
+        """
+        Scores the new generation across the worker pool on the world's level,
+        then sets the world up to replay it for the fittest agents.
+        """
+        self.fitness = self.evaluator.evaluate(self.population, partial(evaluate_on_dino, track=self.world.track), EVAL_CHUNK_SIZE)
 
-        for i, dino in enumerate(self.dinos):
-            if not dino.alive:
-                continue
-
-            inputs = self.get_inputs(dino, next_obstacle)
-            _, dino_jump, duck = self.agents[i].decide(inputs)
-            # Prioritize jump over duck
-            if dino_jump:
-                dino.jump()
-                dino.stand_up()
-            elif duck:
-                dino.duck()
-            else:
-                dino.stand_up()
-
-            if self.check_collision(dino):
-                dino.alive = False
-            else:
-                alive_count += 1
-
-            for obs in self.core.obstacles:
-                if not obs.passed and obs.x + obs.width < dino.x:
-                    obs.passed = True
-                    self.scores[i] = getattr(dino, 'score', 0)
-
-                    if self.scores[i] > best_score:
-                        best_score = self.scores[i]
-                        best_index = i
-
-        if best_score % 50 == 0 and best_score != 0:
-            if best_index != -1:
-                save_best_agent(self.agents[best_index], best_score, self.generation, dino_config.SAVE_MODEL_PATH)
-                print(f"[Checkpoint] Saved agent at score {best_score}")
-
-        if alive_count == 0:
+        self.shown = np.argsort(self.fitness)[::-1][:self.world.num_agents]
+        shown = Population(self.population.genomes[self.shown], self.population.layout)
+        self.policy = CompactingPolicy(PopulationNetwork.from_population(shown).compile_for("dino"))
+
+    def reset_world(self):
+        """
+        Resets the world in place for a new generation, on the level its track
+        (or, without one, its rng) sets.
+        """
+        self.world.reset()
+        self.best_score = 0  # Best score among the live dinos, for checkpoints
+
+    def current_score(self):
+        """
+        :return: Best score among the live dinos, 0 if none is alive
+        """
+        alive = self.world.alive_indices()
+        return int(self.world.dino_score[alive].max()) if len(alive) else 0
+
+    def update(self):
+        """
+        Plays one frame like the headless evaluation: the world moves, scores
+        and collides every dino at once, then the live dinos decide and act.
+        """
+        world = self.world
+        world.update()
+
+        alive = world.alive_indices()
+        if len(alive):
+            inputs = observations.observe_world(world, alive, self.observations)
+            self.jump[alive], self.duck[alive] = self.policy.decide(inputs, alive)
+            world.act(self.jump, self.duck)  # Jump takes priority over duck
+
+        best_score = self.current_score()
+        if best_score > self.best_score and best_score % 50 == 0:
+            best_index = alive[np.argmax(world.dino_score[alive])]
+            save_best_agent(self.population.agent(self.shown[best_index]), best_score, self.generation, dino_config.SAVE_MODEL_PATH)
+            print(f"[Checkpoint] Saved agent at score {best_score}")
+        self.best_score = best_score
+
+        # A level ends at the evaluation's score cap, where its track runs out
+        if not len(alive) or best_score >= DINO_MAX_SCORE:
             self.generation += 1
             self.reset_generation()
 
-    def check_collision(self, dino):
-        dino_bounds = dino.get_bounds()
-        for obs in self.core.obstacles:
-            o_bounds = obs.get_bounds()
-            if (
-                dino_bounds[2] > o_bounds[0] and dino_bounds[0] < o_bounds[2] and
-                dino_bounds[3] > o_bounds[1] and dino_bounds[1] < o_bounds[3]
-            ):
-                return True
-        return False
-
     def draw(self):
         self.screen.fill((255, 255, 255))
-        pygame.draw.rect(
-            self.screen,
-            (100, 100, 100),
-            (0, dino_config.SCREEN_HEIGHT - dino_config.GROUND_HEIGHT, dino_config.SCREEN_WIDTH, dino_config.GROUND_HEIGHT)
-        )
-
-        for obs in self.core.obstacles:
-            obs.draw(self.screen)
-
-        for dino in self.dinos:
-            if dino.alive:
-                dino.draw(self.screen)
+        self.renderer.draw_dino_world(self.screen, self.world)
 
         elapsed = time.time() - self.start_time
-        current_score = max(self.scores[i] for i in range(dino_config.NUM_AGENTS) if self.dinos[i].alive) if any(d.alive for d in self.dinos) else 0
-        alive_count = sum(1 for d in self.dinos if d.alive)
+        alive_count = len(self.world.alive_indices())
 
         self.draw_text(f"Generation: {self.generation}", 10, 10)
         self.draw_text(f"Training Time: {elapsed:.1f}s", 10, 40)
-        self.draw_text(f"Score: {current_score}", 10, 70)
-        self.draw_text(f"Alive: {alive_count}/{dino_config.NUM_AGENTS}", 10, 100)
+        self.draw_text(f"Score: {self.current_score()}", 10, 70)
+        self.draw_text(f"Alive: {alive_count}/{self.world.num_agents}", 10, 100)
 
         pygame.display.flip()
 
@@ -172,13 +160,17 @@ class DinoVisualizer:
 
     def run(self):
         running = True
-        while running:
-            self.clock.tick(dino_config.FPS)
-            running = self.handle_events()
-            self.update()
-            self.draw()
-
-        pygame.quit()
+        try:
+            while running:
+                self.clock.tick(dino_config.FPS)
+                running = self.handle_events()
+                self.update()
+                self.draw()
+        finally:
+            # Also runs when training is interrupted or fails; then the workers are killed
+            if self.evaluator is not None:
+                self.evaluator.close(terminate=running)
+            pygame.quit()
     
     def watch_best(self, model_path=None):
         """
@@ -193,9 +185,13 @@ class DinoVisualizer:
             print("No saved Dino agent found.")
             return
 
-        agent = create_agent_from_genome(best["genome"], input_size=dino_config.INPUT_SIZE)
+        agent = create_agent_from_genome(best["genome"], input_size=dino_config.INPUT_SIZE, topology=best.get("topology"))
+        policy = PopulationNetwork.from_agents([agent]).compile_for("dino")
         dino = Dino(50, dino_config.SCREEN_HEIGHT - dino_config.GROUND_HEIGHT - dino_config.DINO_HEIGHT)
+        buffer = observations.allocate(1)
         core = DinoCore()
+        activations = None
+        step = 0
 
         clock = pygame.time.Clock()
         running = True
@@ -215,30 +211,30 @@ class DinoVisualizer:
             # Get next obstacle
             next_obstacle = core.get_next_obstacle()
 
-            # Build input vector
-            inputs = self.get_inputs(dino, next_obstacle)
-
-            _, dino_jump, duck, activations = agent.decide_with_activations(inputs)
-            if dino_jump:
-                dino.jump()
-                dino.stand_up()
-            elif duck:
-                dino.duck()
-            else:
-                dino.stand_up()
+            decide = step % dino_config.DECISION_INTERVAL == 0
+            step += 1
+            if decide:
+                # Build input vector
+                inputs = observations.observe_dinos([dino], [0], next_obstacle, buffer)
+
+                if visualizer_enabled:
+                    _, dino_jump, duck, activations = agent.decide_with_activations(inputs[0])
+                else:
+                    jumps, ducks = policy.decide(inputs)
+                    dino_jump, duck = jumps[0], ducks[0]
+
+            # Between decisions the last action is repeated, or the dino keeps its pose
+            if decide or dino_config.HOLD_ACTIONS:
+                if dino_jump:
+                    dino.jump()
+                    dino.stand_up()
+                elif duck:
+                    dino.duck()
+                else:
+                    dino.stand_up()
 
             self.screen.fill((255, 255, 255))
-            pygame.draw.rect(
-                self.screen,
-                (100, 100, 100),
-                (0, dino_config.SCREEN_HEIGHT - dino_config.GROUND_HEIGHT, dino_config.SCREEN_WIDTH, dino_config.GROUND_HEIGHT)
-            )
-
-            for obs in core.obstacles:
-                obs.draw(self.screen)
-
-            if dino.alive:
-                dino.draw(self.screen)
+            self.renderer.draw_world(self.screen, core, [dino])
 
             self.draw_text(f"Best Agent - Gen {best['generation']} / Fitness: {best['fitness']:.2f}", 10, 10)
             self.draw_text(f"Score: {getattr(dino, 'score', 0)}", 10, 40)
@@ -258,7 +254,7 @@ class DinoVisualizer:
             ]
 
             output_labels = ["Dino Jump", "Duck"]
-            if visualizer_enabled:
+            if visualizer_enabled and activations is not None:
                 draw_network_visualization(self.screen, activations,input_labels=input_labels, output_labels=output_labels)
 
             pygame.display.flip()
@@ -281,59 +277,45 @@ class DinoVisualizerWithConfig(DinoVisualizer):
 
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 24)
+        self.renderer = DinoRenderer()
 
         self.generation = 1
         self.start_time = time.time()
-        self.agents = []
-        self.core = DinoCore()
+        self.population = None
+        self.evaluator = None  # Experiments share one window and train in-process
+        self.allocate_world(experiment_config.num_agents)
 
         self.reset_generation()
 
     def reset_generation(self):
-        if self.agents:
-            fitness_scores = [self.scores[i] for i in range(len(self.agents))]
-            self.agents = evolve_agents(
-                self.agents,
+        if self.population is not None:
+            fitness_scores = self.world.dino_score
+            self.population, self.offspring = evolve_population(
+                self.population,
                 fitness_scores,
                 retain_top=self.retain_top,
-                mutate_rate=self.mutation_rate
-            )
+                mutate_rate=self.mutation_rate,
+                out=self.offspring
+            ), self.population
         else:
-            self.agents = [
-                Agent(dino_config.INPUT_SIZE)
-                for _ in range(self.experiment_config.num_agents)
-            ]
+            self.population = Population.random(
+                self.experiment_config.num_agents,
+                GenomeLayout(dino_config.INPUT_SIZE)
+            )
+            self.offspring = Population(np.empty_like(self.population.genomes), self.population.layout)  # Spare genome buffer for evolve_population
 
-        self.core.reset()
-        self.dinos = [
-            Dino(
-                50,
-                dino_config.SCREEN_HEIGHT - dino_config.GROUND_HEIGHT - dino_config.DINO_HEIGHT
-            ) for _ in range(self.experiment_config.num_agents)
-        ]
-        self.scores = [0 for _ in range(self.experiment_config.num_agents)]
+        self.shown = np.arange(len(self.population))
+        self.policy = CompactingPolicy(PopulationNetwork.from_population(self.population).compile_for("dino"))
+        self.reset_world()
 
     def draw(self):
         surface = pygame.Surface((dino_config.SCREEN_WIDTH, dino_config.SCREEN_HEIGHT))
         surface.fill((255, 255, 255))
-
-        pygame.draw.rect(
-            surface,
-            (100, 100, 100),
-            (0, dino_config.SCREEN_HEIGHT - dino_config.GROUND_HEIGHT,
-             dino_config.SCREEN_WIDTH, dino_config.GROUND_HEIGHT)
-        )
-
-        for obs in self.core.obstacles:
-            obs.draw(surface)
-
-        for dino in self.dinos:
-            if dino.alive:
-                dino.draw(surface)
+        self.renderer.draw_dino_world(surface, self.world)
 
         elapsed = time.time() - self.start_time
-        alive_count = sum(1 for d in self.dinos if d.alive)
-        current_score = max(self.scores[i] for i in range(len(self.scores)) if self.dinos[i].alive) if any(d.alive for d in self.dinos) else 0
+        alive_count = len(self.world.alive_indices())
+        current_score = self.current_score()
 
         self.draw_text_on(surface, f"{self.experiment_config.label}", 10, 10)
         self.draw_text_on(surface, f"Gen: {self.generation}", 10, 40)
@@ -0,0 +1,360 @@
+"""
+world.py
+
+Defines the DinoWorld class, a vectorized headless Dino simulation for
+training. Dino state (y, velocity, on_ground, ducking, alive, score) is stored
+as struct-of-arrays and obstacles live in a small fixed-capacity array.
+Obstacle passing and collisions are resolved for all dinos at once: every dino
+shares the same x, so an obstacle is passed by all live dinos in the same
+frame and a single flag per obstacle replaces the per-dino passed_by sets.
+Per-frame dino math gathers only the rows of the surviving dinos (alive_rows),
+so a frame costs in proportion to the survivors, not to the population.
+
+Physics, spawning, the speed ramp and the padded collision boxes are identical
+to DinoCore + Dino, including the jump/duck priority of the training loops.
+"""
+
+import numpy as np
+from games.clock import SimulationClock
+import games.dino.config as config
+
+# Initial number of obstacle slots; grows if more obstacles are on screen at once
+OBSTACLE_CAPACITY = 8
+
+DINO_X = 50
+GROUND_Y = config.SCREEN_HEIGHT - config.GROUND_HEIGHT
+
+# Collision padding, as in Dino.get_bounds and BaseObstacle.get_bounds
+DINO_PADDING_X = 4
+DINO_PADDING_Y = 2
+OBSTACLE_PADDING = 5
+
+
+class DinoWorld:
+    """
+    Vectorized Dino game state for a population of dinos sharing one obstacle course.
+    """
+
+    def __init__(self, num_agents=1, clock=None, rng=None, track=None):
+        """
+        :param clock: Time source advanced once per update; a SimulationClock at config.FPS if None
+        :param rng: numpy Generator for obstacle types and spawn delays; a fresh unseeded one if None
+        :param track: Precomputed level (see games.tracks); when given, obstacles are spawned
+                      from it instead of from the clock and rng
+        """
+        self.num_agents = num_agents
+        self.clock = clock if clock is not None else SimulationClock(config.FPS)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.track = track
+        self.dino_x = DINO_X
+        self.dino_width = config.DINO_RUN_SIZE[0]
+
+        n = num_agents
+        self.dino_y = np.empty(n)
+        self.dino_velocity = np.empty(n)
+        self.dino_on_ground = np.empty(n, dtype=bool)
+        self.dino_ducking = np.empty(n, dtype=bool)
+        self.dino_alive = np.empty(n, dtype=bool)
+        self.dino_score = np.empty(n, dtype=np.int64)
+
+        # Obstacles in spawn order (leftmost first); only the first num_obstacles slots are used
+        self.obstacle_x = np.zeros(OBSTACLE_CAPACITY)
+        self.obstacle_speed = np.zeros(OBSTACLE_CAPACITY)
+        self.obstacle_flying = np.zeros(OBSTACLE_CAPACITY, dtype=bool)
+        self.obstacle_passed = np.zeros(OBSTACLE_CAPACITY, dtype=bool)
+
+        self.reset()
+
+    def reset(self):
+        """
+        Resets the game state. Arrays are overwritten in place, so a world can
+        be reused across generations without reallocating.
+        """
+        self.dino_y.fill(GROUND_Y - config.DINO_RUN_SIZE[1])
+        self.dino_velocity.fill(0)
+        self.dino_on_ground.fill(True)
+        self.dino_ducking.fill(False)
+        self.dino_alive.fill(True)
+        self.dino_score.fill(0)
+        self.alive_rows = np.arange(self.num_agents)  # Sorted indices of the live dinos
+
+        self.num_obstacles = 0
+        self.obstacles_spawned = 0
+
+        self.frame = 0
+        self.track_index = 0
+        self.last_spawn_time = self.clock.ticks()
+        self.next_spawn_delay = None if self.track is not None else self.spawn_delay()
+        self.game_speed = config.BASE_SPEED
+        self.speed_timer = self.clock.ticks()
+        self.alive = True
+
+    def dino_height(self, rows):
+        """
+        :param rows: Dino indices
+        :return: Current height of those dinos (ducking dinos are shorter)
+        """
+        return np.where(self.dino_ducking[rows], config.DINO_DUCK_SIZE[1], config.DINO_RUN_SIZE[1])
+
+    def obstacle_size(self, slots):
+        """
+        :return: Tuple (width, height, y) arrays of the obstacles in the given slots
+        """
+        flying = self.obstacle_flying[slots]
+        width = np.where(flying, config.FLYING_OBSTACLE_SIZE[0], config.CACTUS_SIZE[0])
+        height = np.where(flying, config.FLYING_OBSTACLE_SIZE[1], config.CACTUS_SIZE[1])
+        y = np.where(flying, GROUND_Y - 80, GROUND_Y - config.CACTUS_SIZE[1])
+        return width, height, y
+
+    def spawn_delay(self):
+        """
+        :return: Random delay in ms until the next spawn attempt
+        """
+        return int(self.rng.integers(config.MIN_OBSTACLE_DELAY, config.MAX_OBSTACLE_DELAY, endpoint=True))
+
+    def spawn_obstacle(self, flying=None, speed=None):
+        """
+        Spawns an obstacle at the right edge, unless the previous one is still
+        too close. With flying/speed given (from a track) it always spawns.
+
+        :param flying: Obstacle type; drawn from rng if None
+        :param speed: Obstacle speed; the current game speed if None
+        """
+        n = self.num_obstacles
+        if flying is None and n and self.obstacle_x[n - 1] > config.SCREEN_WIDTH - 200:
+            return
+        if n == len(self.obstacle_x):
+            capacity = 2 * n
+            self.obstacle_x = np.resize(self.obstacle_x, capacity)
+            self.obstacle_speed = np.resize(self.obstacle_speed, capacity)
+            self.obstacle_flying = np.resize(self.obstacle_flying, capacity)
+            self.obstacle_passed = np.resize(self.obstacle_passed, capacity)
+
+        if flying is None:
+            flying = not self.rng.random() < 0.7  # 70% chance to spawn a cactus
+        self.obstacle_flying[n] = flying
+        self.obstacle_x[n] = config.SCREEN_WIDTH
+        self.obstacle_speed[n] = speed if speed is not None else self.game_speed
+        self.obstacle_passed[n] = False
+        self.num_obstacles = n + 1
+        self.obstacles_spawned += 1
+
+    def spawn_from_track(self):
+        """
+        Spawns the obstacles the track schedules for the current frame.
+        """
+        track = self.track
+        while self.track_index < len(track) and track["frame"][self.track_index] == self.frame:
+            self.spawn_obstacle(bool(track["flying"][self.track_index]), track["speed"][self.track_index])
+            self.track_index += 1
+
+    def remove_offscreen_obstacles(self):
+        """
+        Drops obstacles that left the screen and shifts the rest to the front.
+        """
+        n = self.num_obstacles
+        width, _, _ = self.obstacle_size(slice(0, n))
+        keep = self.obstacle_x[:n] + width >= 0
+        if not keep.all():
+            kept = int(np.count_nonzero(keep))
+            for array in (self.obstacle_x, self.obstacle_speed, self.obstacle_flying, self.obstacle_passed):
+                array[:kept] = array[:n][keep]
+            self.num_obstacles = kept
+
+    def update(self):
+        """
+        Advances obstacles and all live dinos by one frame, then scores
+        passed obstacles and resolves collisions.
+        """
+        self.update_level()
+        self.update_entities()
+
+    def update_level(self):
+        """
+        First half of a frame: advances the clock, the speed ramp and obstacle spawning.
+        """
+        self.clock.tick()
+        self.frame += 1
+        if self.track is not None:
+            self.spawn_from_track()
+        else:
+            # Gradually increase speed
+            now = self.clock.ticks()
+            if now - self.speed_timer > 3000:
+                self.game_speed += 0.1
+                self.game_speed = min(self.game_speed, 12)
+                self.speed_timer = now
+
+            # Obstacle spawning
+            now = self.clock.ticks()
+            if now - self.last_spawn_time > self.next_spawn_delay:
+                self.spawn_obstacle()
+                self.last_spawn_time = now
+                self.next_spawn_delay = self.spawn_delay()
+
+    def update_entities(self):
+        """
+        Second half of a frame: moves obstacles and dinos, scores passed
+        obstacles and resolves collisions.
+        """
+        self.obstacle_x[:self.num_obstacles] -= self.obstacle_speed[:self.num_obstacles]
+        self.remove_offscreen_obstacles()
+
+        # Gravity for airborne live dinos
+        rows = self.alive_rows
+        airborne = rows[~self.dino_on_ground[rows]]
+        if len(airborne):
+            velocity = self.dino_velocity[airborne] + config.GRAVITY
+            y = self.dino_y[airborne] + velocity
+            floor = GROUND_Y - self.dino_height(airborne)
+            landed = y >= floor
+            y[landed] = floor[landed]
+            velocity[landed] = 0
+            self.dino_y[airborne] = y
+            self.dino_velocity[airborne] = velocity
+            self.dino_on_ground[airborne[landed]] = True
+
+        # Obstacles passed this frame count for every dino alive before the collision check
+        n = self.num_obstacles
+        width, height, obstacle_y = self.obstacle_size(slice(0, n))
+        passed = ~self.obstacle_passed[:n] & (self.obstacle_x[:n] + width < self.dino_x)
+        passed_count = int(np.count_nonzero(passed))
+        if passed_count:
+            self.obstacle_passed[:n] |= passed
+            self.dino_score[rows] += passed_count
+
+        hit = self.check_collisions(width, height, obstacle_y, rows)
+        if hit.any():
+            self.dino_alive[rows[hit]] = False
+            self.alive_rows = rows = rows[~hit]
+        self.alive = len(rows) > 0
+
+    def check_collisions(self, width, height, obstacle_y, rows):
+        """
+        Padded box collision of the given dinos against the obstacles that
+        overlap the dinos' column horizontally.
+
+        :param rows: Dino indices to test, e.g. alive_rows
+        :return: Boolean array like rows, True where a dino hits an obstacle
+        """
+        n = self.num_obstacles
+        left = self.obstacle_x[:n] + OBSTACLE_PADDING
+        right = self.obstacle_x[:n] + width - OBSTACLE_PADDING
+        overlapping = (
+            (self.dino_x + self.dino_width - DINO_PADDING_X > left) &
+            (self.dino_x + DINO_PADDING_X < right)
+        )
+
+        y = self.dino_y[rows]
+        top = y + DINO_PADDING_Y
+        bottom = y + self.dino_height(rows) - DINO_PADDING_Y
+        hit = np.zeros(len(rows), dtype=bool)
+        for o_top, o_height in zip(obstacle_y[overlapping], height[overlapping]):
+            hit |= (bottom > o_top + OBSTACLE_PADDING) & (top < o_top + o_height - OBSTACLE_PADDING)
+        return hit
+
+    def is_quiescent(self):
+        """
+        True if no obstacle is on screen and every live dino stands or ducks on
+        the ground. Nothing but the level clock changes in such a frame, and the
+        dinos' observations stay the same until an obstacle spawns.
+        """
+        return self.num_obstacles == 0 and bool(self.dino_on_ground[self.alive_rows].all())
+
+    def fast_forward(self, max_frames=None):
+        """
+        Skips a quiescent stretch: moves the level straight to the frame of the
+        next spawn, then completes that frame like update(). Gives exactly the
+        state frame-by-frame updates would, as long as the dinos' actions stay
+        the same meanwhile, which holds when their last actions left them
+        unchanged (see act).
+
+        The spawn frame is read from the track, or computed from the spawn timer
+        with a SimulationClock (speed ramp steps in between are replayed on
+        their frames). Other clocks step the level one frame at a time.
+
+        :param max_frames: Stop after this many frames even if nothing spawned
+        :return: Number of frames advanced, the last one fully updated
+        """
+        if self.track is None and not isinstance(self.clock, SimulationClock):
+            frames = 0
+            while max_frames is None or frames < max_frames:
+                self.update_level()
+                frames += 1
+                if self.num_obstacles:
+                    break
+            self.update_entities()
+            return frames
+
+        # Frames to skip before the one that spawns
+        if self.num_obstacles:
+            skip = 0
+        elif self.track is not None:
+            if self.track_index < len(self.track):
+                skip = int(self.track["frame"][self.track_index]) - self.frame - 1
+            else:
+                skip = (max_frames or 1) - 1  # Nothing left to spawn
+        else:
+            spawn_frame = self.clock.first_frame_after(self.last_spawn_time + self.next_spawn_delay)
+            skip = spawn_frame - self.clock.frame - 1
+        skip = max(skip, 0)
+        if max_frames is not None:
+            skip = min(skip, max_frames - 1)
+
+        if self.track is None:
+            # Speed ramp steps that fall within the skipped frames
+            last = self.clock.frame + skip
+            ramp_frame = self.clock.first_frame_after(self.speed_timer + 3000)
+            while ramp_frame <= last:
+                self.game_speed += 0.1
+                self.game_speed = min(self.game_speed, 12)
+                self.speed_timer = ramp_frame * 1000 // self.clock.fps
+                ramp_frame = self.clock.first_frame_after(self.speed_timer + 3000)
+        self.clock.tick(skip)
+        self.frame += skip
+
+        self.update()
+        return skip + 1
+
+    def act(self, jump, duck):
+        """
+        Applies decisions to the live dinos with the training priority:
+        jump (and stand up), else duck, else stand up.
+
+        :param jump: Boolean array, one entry per dino
+        :param duck: Boolean array, one entry per dino
+        :return: True if any dino changed state (took off, ducked or stood up)
+        """
+        rows = self.alive_rows
+        jump = jump[rows]
+        ducks = duck[rows] & ~jump
+        ducking = self.dino_ducking[rows]
+
+        takeoff = rows[jump & self.dino_on_ground[rows]]
+        self.dino_velocity[takeoff] = config.JUMP_VELOCITY
+        self.dino_on_ground[takeoff] = False
+
+        # Standing up or ducking snaps the dino to the ground line, as in Dino
+        stand = rows[~ducks & ducking]
+        self.dino_ducking[stand] = False
+        self.dino_y[stand] = GROUND_Y - config.DINO_RUN_SIZE[1]
+
+        crouch = rows[ducks & ~ducking]
+        self.dino_ducking[crouch] = True
+        self.dino_y[crouch] = GROUND_Y - config.DINO_DUCK_SIZE[1]
+        return bool(len(takeoff) or len(stand) or len(crouch))
+
+    def next_obstacle(self):
+        """
+        :return: Slot of the first obstacle still on screen, or None (same as DinoCore.get_next_obstacle)
+        """
+        n = self.num_obstacles
+        width, _, _ = self.obstacle_size(slice(0, n))
+        ahead = np.flatnonzero(self.obstacle_x[:n] + width > 0)
+        return int(ahead[0]) if len(ahead) else None
+
+    def alive_indices(self):
+        """
+        :return: Sorted indices of the dinos that are still alive (do not modify)
+        """
+        return self.alive_rows
\ No newline at end of file
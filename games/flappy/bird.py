@@ -4,9 +4,11 @@ bird.py
 Defines the Bird class, representing the player or agent character in the game.
 Handles movement mechanics such as gravity, jumping, and position tracking,
 as well as bounding box calculations for collision detection.
+
+Birds hold no sprites; they are drawn by games.flappy.renderer.FlappyRenderer.
 """
 
-import pygame
+from games.flappy import config
 
 class Bird:    
     """
@@ -15,7 +17,7 @@ class Bird:
     """
 
 
-    def __init__(self, x: float, y: float, sprite_sheet = None, radius: int = 10):
+    def __init__(self, x: float, y: float, radius: int = config.BIRD_RADIUS):
         """
         Initialize the bird with its position and default physics parameters.
 
@@ -24,21 +26,26 @@ class Bird:
         :param radius: Radius of the bird (for collision detection)
         """
         self.x = x
-        self.y = y
         self.radius = radius
 
-        self.gravity = 0.5        # Acceleration due to gravity
-        self.jump_strength = -8   # Velocity when jumping
+        self.gravity = config.BIRD_GRAVITY              # Acceleration due to gravity
+        self.jump_strength = config.BIRD_JUMP_STRENGTH  # Velocity when jumping
+        self.reset(y)
+
+
+    def reset(self, y: float):
+        """
+        Puts the bird back to its start state in place, so birds can be reused
+        across generations.
+
+        :param y: Vertical start position
+        """
+        self.y = y
         self.velocity_y = 0       # Vertical speed
 
         self.alive = True         # Status flag
 
-        # Bird animation setup
-        self.sprite_sheet = sprite_sheet
-        self.frames = [
-            pygame.transform.scale(sprite_sheet.subsurface(pygame.Rect(i * 16, 0, 16, 16)), (24, 24))
-            for i in range(4)
-        ]
+        # Bird animation state, frames are owned by the renderer
         self.frame_index = 0
         self.animation_counter = 0
         self.time_alive = 0
@@ -55,7 +62,7 @@ class Bird:
         # Animate
         self.animation_counter += 1
         if self.animation_counter % 5 == 0:
-            self.frame_index = (self.frame_index + 1) % len(self.frames)
+            self.frame_index = (self.frame_index + 1) % config.BIRD_FRAMES
 
 
     def jump(self):
@@ -65,10 +72,6 @@ class Bird:
         self.velocity_y = self.jump_strength
 
 
-    def draw(self, surface):
-        sprite = self.frames[self.frame_index]
-        surface.blit(sprite, (int(self.x - self.radius), int(self.y - self.radius)))
-
     def get_position(self):
         """
         Get the current (x, y) position of the bird.
@@ -11,6 +11,12 @@ PIPE_WIDTH = 32
 # Pipe movement speed to the left
 PIPE_SPEED = 3
 
+# Bird physics
+BIRD_X = 80
+BIRD_RADIUS = 10
+BIRD_GRAVITY = 0.5
+BIRD_JUMP_STRENGTH = -8
+
 BACKGROUND_COLOR = (30, 30, 30)
 BIRD_COLOR = (255, 200, 0)
 PIPE_COLOR = (100, 255, 100)
@@ -23,7 +29,22 @@ BIRD_SPRITE = f"{ASSET_PATH}/Bird.png"
 PIPE_SPRITE = f"{ASSET_PATH}/PipeStyle.png"
 IMAGE_PIPE_WIDTH = 32
 IMAGE_PIPE_HEIGHT = 80
+# Animation frames in the bird sprite sheet
+BIRD_FRAMES = 4
 
 #Training parameters
 NUM_AGENTS = 2000
-SAVE_MODEL_PATH = "model/flappy_best.pkl"
\ No newline at end of file
+SAVE_MODEL_PATH = "model/flappy_best.pkl"
+
+# Watch mode: run the network every DECISION_INTERVAL frames; in between,
+# HOLD_ACTIONS repeats the last action, otherwise no input is given
+DECISION_INTERVAL = 1
+HOLD_ACTIONS = False
+
+# Parallel training: with NUM_WORKERS > 1 the visual trainer scores each
+# generation headless across that many worker processes, on a level seeded
+# from RUN_SEED, and the window replays that level for the DISPLAY_AGENTS
+# fittest agents only
+NUM_WORKERS = 1
+DISPLAY_AGENTS = 50
+RUN_SEED = 0
\ No newline at end of file
@@ -1,10 +1,18 @@
 """
 core.py
 
-Shared base game logic that will be used by the training and manual play
+Shared base game logic that will be used by the training and manual play.
+Headless: no Pygame import, rendering is done by games.flappy.renderer.
+
+Pipes spawn at the right edge and all move at the same speed, so the pipe
+deque is always ordered by x: offscreen pipes leave from the front, and the
+next pipe and collision candidates are found by walking from the front and
+stopping at the first pipe beyond the birds' column.
 """
 
-import pygame
+from collections import deque
+import numpy as np
+from games.clock import SimulationClock
 from games.flappy import config
 from games.flappy.bird import Bird
 from games.flappy.pipe import Pipe
@@ -15,10 +23,18 @@ class GameCore:
     Can support single or multiple birds.
     """
 
-    def __init__(self, bird_sprite, pipe_sprite_sheet, num_agents=1):
-        self.bird_sprite = bird_sprite
-        self.pipe_sprite_sheet = pipe_sprite_sheet
+    def __init__(self, num_agents=1, clock=None, rng=None, track=None):
+        """
+        :param clock: Time source advanced once per update; a SimulationClock at config.FPS if None
+        :param rng: numpy Generator for level randomness; a fresh unseeded one if None
+        :param track: Precomputed level (see games.tracks); when given, pipes are spawned
+                      from it instead of from the clock and rng
+        """
         self.num_agents = num_agents
+        self.clock = clock if clock is not None else SimulationClock(config.FPS)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.track = track
+        self.birds = [Bird(config.BIRD_X, config.SCREEN_HEIGHT // 2) for _ in range(num_agents)]
 
         self.reset()
 
@@ -26,76 +42,117 @@ class GameCore:
         """
         Resets the game state.
         """
-        self.birds = [Bird(80, config.SCREEN_HEIGHT // 2, self.bird_sprite) for _ in range(self.num_agents)]
-        self.pipes = []
-        self.last_pipe_time = pygame.time.get_ticks()
+        for bird in self.birds:
+            bird.reset(config.SCREEN_HEIGHT // 2)
+        self.alive_indices = list(range(self.num_agents))  # Only these birds are stepped
+        self.pipes = deque()  # Ordered by x, leftmost first
+        self.frame = 0
+        self.track_index = 0
+        self.last_pipe_time = self.clock.ticks()
         self.score = 0
         self.alive = True
 
 
-    def spawn_pipe(self):
+    def spawn_pipe(self, gap_y=None):
         """
         Spawns a new pipe with randomized appearance.
+
+        :param gap_y: Top of the gap; drawn from rng if None
+        """
+        col = self.clock.ticks() // 1500 % 4
+        row = (self.clock.ticks() // 3000) % 2
+        self.pipes.append(Pipe(config.SCREEN_WIDTH, (col, row), rng=self.rng, gap_y=gap_y))
+
+    def spawn_from_track(self):
+        """
+        Spawns the pipes the track schedules for the current frame.
         """
-        col = pygame.time.get_ticks() // 1500 % 4
-        row = (pygame.time.get_ticks() // 3000) % 2
-        rect = pygame.Rect(
-            col * config.IMAGE_PIPE_WIDTH,
-            row * config.IMAGE_PIPE_HEIGHT,
-            config.IMAGE_PIPE_WIDTH,
-            config.IMAGE_PIPE_HEIGHT
-        )
-        pipe_img = self.pipe_sprite_sheet.subsurface(rect).copy()
-        self.pipes.append(Pipe(config.SCREEN_WIDTH, pipe_img))
+        track = self.track
+        while self.track_index < len(track) and track["frame"][self.track_index] == self.frame:
+            self.spawn_pipe(track["gap_y"][self.track_index])
+            self.track_index += 1
 
         
     def update(self, agent_decisions=None):
         """
         Updates game state.
 
-        :param agent_decisions: List of bools; each True = jump. Used for AI control.
+        :param agent_decisions: List or boolean array, one entry per bird; True = jump. Used for AI control.
         """
-        now = pygame.time.get_ticks()
-        if now - self.last_pipe_time > config.PIPE_INTERVAL:
-            self.spawn_pipe()
-            self.last_pipe_time = now
+        self.clock.tick()
+        self.frame += 1
+        if self.track is not None:
+            self.spawn_from_track()
+        else:
+            now = self.clock.ticks()
+            if now - self.last_pipe_time > config.PIPE_INTERVAL:
+                self.spawn_pipe()
+                self.last_pipe_time = now
 
         for pipe in self.pipes:
             pipe.update()
-        self.pipes = [p for p in self.pipes if not p.is_off_screen()]
-
-        all_dead = True
+        while self.pipes and self.pipes[0].is_off_screen():
+            self.pipes.popleft()
 
-        for idx, bird in enumerate(self.birds):
-            if not bird.alive:
-                continue
+        # Every bird shares the same column, so the broadphase runs once per frame
+        candidates = self.pipes_in_column(config.BIRD_X - config.BIRD_RADIUS, config.BIRD_X + config.BIRD_RADIUS)
+        for idx in self.alive_indices:
+            bird = self.birds[idx]
 
             # Decision logic: agent or manual
-            if agent_decisions and agent_decisions[idx]:
+            if agent_decisions is not None and agent_decisions[idx]:
                 bird.jump()
 
             bird.update()
-            if self.check_collision(bird):
+            if self.check_collision(bird, candidates):
                 bird.alive = False
-            else:
-                all_dead = False
+
+        self.alive_indices = [idx for idx in self.alive_indices if self.birds[idx].alive]
 
         for pipe in self.pipes:
-            if not pipe.passed and pipe.x + pipe.width < self.birds[0].x:
+            if pipe.x + pipe.width >= self.birds[0].x:
+                break  # This and all later pipes are still ahead
+            if not pipe.passed:
                 pipe.passed = True
-                for bird in self.birds:
-                    if bird.alive:
-                        bird.score += 1  # Give each surviving bird the score
+                for idx in self.alive_indices:
+                    self.birds[idx].score += 1  # Give each surviving bird the score
                 self.score += 1
                 
-        self.alive = not all_dead
+        self.alive = bool(self.alive_indices)
+
+    def pipes_in_column(self, left, right):
+        """
+        Broadphase: pipes that horizontally overlap the column [left, right].
+
+        :return: List of at most a couple of pipes
+        """
+        candidates = []
+        for pipe in self.pipes:
+            if pipe.x >= right:
+                break
+            if pipe.x + pipe.width > left:
+                candidates.append(pipe)
+        return candidates
+
+    def next_pipe(self, x=config.BIRD_X):
+        """
+        :return: The closest pipe whose right edge is still ahead of x, or None
+        """
+        for pipe in self.pipes:
+            if pipe.x + pipe.width > x:
+                return pipe
+        return None
 
-    def check_collision(self, bird):
+    def check_collision(self, bird, candidates=None):
         """
         Collision detection for a single bird.
+
+        :param candidates: Pipes overlapping the bird's column; looked up if None
         """
         bounds = bird.get_bounds()
-        for pipe in self.pipes:
+        if candidates is None:
+            candidates = self.pipes_in_column(bounds[0], bounds[2])
+        for pipe in candidates:
             top, bottom = pipe.get_bounds()
             for rect in [top, bottom]:
                 l, t, r, b = rect
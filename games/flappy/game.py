@@ -8,8 +8,10 @@ This script can be run standalone for testing or visualization.
 """
 
 import pygame
+from games import assets
 from games.flappy import config
 from games.flappy.core_game import GameCore
+from games.flappy.renderer import FlappyRenderer
 
 
 class FlappyGame:
@@ -23,13 +25,10 @@ class FlappyGame:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 24)
 
-        self.background = pygame.image.load(config.BG_IMAGE).convert()
-        self.background = pygame.transform.scale(self.background, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.background = assets.scaled(config.BG_IMAGE, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT), alpha=False)
 
-        self.bird_sprite = pygame.image.load(config.BIRD_SPRITE).convert_alpha()
-        self.pipe_sprite_sheet = pygame.image.load(config.PIPE_SPRITE).convert_alpha()
-
-        self.engine = GameCore(self.bird_sprite, self.pipe_sprite_sheet)
+        self.renderer = FlappyRenderer()
+        self.engine = GameCore()
 
     def run(self):
         running = True
@@ -57,10 +56,7 @@ class FlappyGame:
     def draw(self):
         self.screen.blit(self.background, (0, 0))
 
-        for bird in self.engine.birds:
-            bird.draw(self.screen)
-        for pipe in self.engine.pipes:
-            pipe.draw(self.screen)
+        self.renderer.draw_world(self.screen, self.engine, alive_only=False)
 
         self.draw_text(f"Score: {self.engine.score}", 10, 10)
         if not self.engine.alive:
@@ -0,0 +1,93 @@
+"""
+observations.py
+
+Batched Flappy observations. Features of every requested bird are written into
+one preallocated (N x NUM_FEATURES) float buffer that is handed straight to
+batched inference. Terms that only depend on the next pipe are computed once
+per frame and broadcast to all rows.
+
+Feature layout (shared with Dino, see games.dino.observations):
+    0 bird y, 1 vertical velocity, 2 distance to pipe, 3 distance to gap center,
+    4 gap size, 5 pipe speed, 6 time to pipe, 7-9 unused,
+    10 one-hot Flappy, 11 one-hot Dino
+"""
+
+import numpy as np
+from games.flappy import config
+
+NUM_FEATURES = 12
+
+
+def allocate(capacity: int) -> np.ndarray:
+    """
+    :return: Observation buffer for up to `capacity` agents
+    """
+    return np.zeros((capacity, NUM_FEATURES))
+
+
+def observe_world(world, rows, out: np.ndarray) -> np.ndarray:
+    """
+    Observations of the given birds of a FlappyWorld.
+
+    :param rows: Bird indices, e.g. world.alive_indices()
+    :param out: Buffer with at least len(rows) rows
+    :return: View of the first len(rows) rows of out, one per bird
+    """
+    inputs = out[:len(rows)]
+    np.take(world.bird_y, rows, out=inputs[:, 0])
+    np.take(world.bird_velocity, rows, out=inputs[:, 1])
+
+    pipe = world.next_pipe()
+    if pipe is None:
+        return finish(inputs, world.bird_x)
+    return finish(inputs, world.bird_x, world.pipe_x[pipe], world.pipe_gap_y[pipe])
+
+
+def observe_birds(birds, rows, next_pipe, out: np.ndarray) -> np.ndarray:
+    """
+    Observations of the given Bird objects of a GameCore.
+
+    :param rows: Bird indices
+    :param next_pipe: Pipe the birds are heading for, or None
+    :param out: Buffer with at least len(rows) rows
+    :return: View of the first len(rows) rows of out, one per bird
+    """
+    inputs = out[:len(rows)]
+    for row, i in enumerate(rows):
+        inputs[row, 0] = birds[i].y
+        inputs[row, 1] = birds[i].velocity_y
+
+    bird_x = birds[rows[0]].x if len(rows) else config.BIRD_X
+    if next_pipe is None:
+        return finish(inputs, bird_x)
+    return finish(inputs, bird_x, next_pipe.x, next_pipe.gap_y)
+
+
+def finish(inputs: np.ndarray, bird_x, pipe_x=None, gap_y=None) -> np.ndarray:
+    """
+    Completes rows whose columns 0 and 1 hold raw y and velocity: normalizes
+    them and fills in the pipe terms, computed once for all rows.
+
+    :param pipe_x: x of the next pipe, or None if there is none
+    :param gap_y: Top of the next pipe's gap
+    """
+    if pipe_x is not None:
+        dx = (pipe_x - bird_x) / config.SCREEN_WIDTH
+        np.subtract(gap_y + config.PIPE_GAP_SIZE / 2, inputs[:, 0], out=inputs[:, 3])
+        inputs[:, 3] /= config.SCREEN_HEIGHT
+        inputs[:, 2] = dx
+        inputs[:, 4] = config.PIPE_GAP_SIZE / config.SCREEN_HEIGHT
+        inputs[:, 5] = 1.0                                       # pipe speed / PIPE_SPEED
+        inputs[:, 6] = dx / (config.PIPE_SPEED + 1e-5)           # time to pipe
+    else:
+        inputs[:, 2] = 1.0
+        inputs[:, 3:5] = 0.0
+        inputs[:, 5] = 1.0
+        inputs[:, 6] = 1.0
+
+    inputs[:, 0] /= config.SCREEN_HEIGHT
+    inputs[:, 1] /= 10.0
+    inputs[:, 7:10] = 0.0
+    inputs[:, 10] = 1.0                                          # One-hot: Flappy
+    inputs[:, 11] = 0.0                                          # One-hot: not Dino
+    return inputs
\ No newline at end of file
@@ -4,9 +4,10 @@ pipe.py
 Defines the Pipe class, which represents an obstacle in the game.
 Each pipe consists of a top and bottom section with a vertical gap.
 This class handles movement, random gap positioning, and collision bounds.
+Pipes hold no images; they are drawn by games.flappy.renderer.FlappyRenderer.
 """
 
-import random, pygame
+import numpy as np
 from games.flappy import config
 
 class Pipe:
@@ -15,13 +16,16 @@ class Pipe:
     """
 
     
-    def __init__(self, x: float, image, gap_size: int = config.PIPE_GAP_SIZE, width: int = config.PIPE_WIDTH):
+    def __init__(self, x: float, style: tuple = (0, 0), gap_size: int = config.PIPE_GAP_SIZE, width: int = config.PIPE_WIDTH, rng: np.random.Generator | None = None, gap_y: int | None = None):
         """
         Initialize a new pipe with a random gap position.
 
         :param x: Initial horizontal position of the pipe
+        :param style: (col, row) of the pipe image in the sprite sheet
         :param gap_size: Vertical space between top and bottom pipes
         :param width: Width of the pipe
+        :param rng: Generator for the gap position; a fresh unseeded one if None
+        :param gap_y: Fixed top of the gap (e.g. from a level track); random if None
         """
         self.x = x
         self.width = width
@@ -31,27 +35,12 @@ class Pipe:
         self.speed = config.PIPE_SPEED
 
         # Random vertical position of the gap (top of the gap)
-        self.gap_y = random.randint(100, config.SCREEN_HEIGHT - 200)
+        if gap_y is None:
+            rng = rng if rng is not None else np.random.default_rng()
+            gap_y = rng.integers(100, config.SCREEN_HEIGHT - 200, endpoint=True)
+        self.gap_y = int(gap_y)
 
-    
-        self.image = image
-        self.image_width = image.get_width()
-        self.image_height = image.get_height()
-
-    def draw(self, surface):
-        """
-        Draw vertically stretched top and bottom pipes.
-        """
-        # Top pipe
-        top_height = self.gap_y
-        top_scaled = pygame.transform.scale(self.image, (self.width, int(top_height)))
-        surface.blit(top_scaled, (int(self.x), 0))
-
-        # Bottom pipe
-        bottom_y = self.gap_y + self.gap_size
-        bottom_height = config.SCREEN_HEIGHT - bottom_y
-        bottom_scaled = pygame.transform.scale(self.image, (self.width, int(bottom_height)))
-        surface.blit(bottom_scaled, (int(self.x), int(bottom_y)))
+        self.style = style
 
     def update(self):
         """
@@ -0,0 +1,67 @@
+"""
+renderer.py
+
+Defines the FlappyRenderer class, which draws a headless GameCore with Pygame.
+Sprites come from the shared asset cache (games.assets): bird frames are cut
+and scaled once per process, and stretched pipes are reused across frames, so
+birds and pipes themselves only hold numbers.
+"""
+
+from games import assets
+from games.flappy import config
+
+# Cell size of one bird frame in the sprite sheet, and its on-screen size
+BIRD_CELL_SIZE = (16, 16)
+BIRD_DRAW_SIZE = (24, 24)
+
+
+class FlappyRenderer:
+    """
+    Draws birds and pipes onto a surface using the shared Flappy sprites.
+    """
+
+    def __init__(self):
+        self.bird_frames = assets.frames(config.BIRD_SPRITE, BIRD_CELL_SIZE, tuple(range(config.BIRD_FRAMES)), BIRD_DRAW_SIZE)
+
+    def pipe_rect(self, style):
+        """
+        :return: Sprite sheet rect of the given (col, row) pipe style
+        """
+        col, row = style
+        return (col * config.IMAGE_PIPE_WIDTH, row * config.IMAGE_PIPE_HEIGHT, config.IMAGE_PIPE_WIDTH, config.IMAGE_PIPE_HEIGHT)
+
+    def pipe_image(self, style, width, height):
+        """
+        :return: The pipe image of a style, stretched to (width, height)
+        """
+        return assets.stretched(config.PIPE_SPRITE, self.pipe_rect(style), (int(width), int(height)))
+
+    def draw_bird(self, surface, bird):
+        sprite = self.bird_frames[bird.frame_index]
+        surface.blit(sprite, (int(bird.x - bird.radius), int(bird.y - bird.radius)))
+
+    def draw_pipe(self, surface, pipe):
+        """
+        Draw vertically stretched top and bottom pipes.
+        """
+        # Top pipe
+        top_height = pipe.gap_y
+        surface.blit(self.pipe_image(pipe.style, pipe.width, top_height), (int(pipe.x), 0))
+
+        # Bottom pipe
+        bottom_y = pipe.gap_y + pipe.gap_size
+        bottom_height = config.SCREEN_HEIGHT - bottom_y
+        surface.blit(self.pipe_image(pipe.style, pipe.width, bottom_height), (int(pipe.x), int(bottom_y)))
+
+    def draw_world(self, surface, engine, alive_only=True):
+        """
+        Draws every pipe and bird of a GameCore.
+
+        :param alive_only: Skip dead birds
+        """
+        for bird in engine.birds:
+            if bird.alive or not alive_only:
+                self.draw_bird(surface, bird)
+
+        for pipe in engine.pipes:
+            self.draw_pipe(surface, pipe)
\ No newline at end of file
@@ -1,10 +1,21 @@
 import pygame
 import time
+from functools import partial
+import numpy as np
+from games import assets
 from games.flappy import config
 from games.flappy.core_game import GameCore
-from core.agent import Agent
+from games.flappy.renderer import FlappyRenderer
+from games.flappy import observations
+from core.agent import GenomeLayout
+from core.inference import PopulationNetwork, CompactingPolicy
+from core.population import Population
 from core.model_utils import save_best_agent, load_best_agent, create_agent_from_genome
-from core.ga import evolve_agents
+from core.ga import evolve_population
+from core.evaluation import ParallelEvaluator
+from core.rng import derive_rng, episode_seed
+from core.multi_train import evaluate_on_flappy, flappy_fitness, FLAPPY_MAX_SCORE, EVAL_CHUNK_SIZE
+from games.tracks import TrackLibrary
 
 from core.network_visualization import draw_network_visualization
 from core.experiments.experiment_config import ExperimentConfig
@@ -20,60 +31,100 @@ class VisualTrainer:
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 24)
 
-        self.background = pygame.image.load(config.BG_IMAGE).convert()
-        self.background = pygame.transform.scale(self.background, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.background = assets.scaled(config.BG_IMAGE, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT), alpha=False)
 
-        self.bird_sprite = pygame.image.load(config.BIRD_SPRITE).convert_alpha()
-        self.pipe_sprite_sheet = pygame.image.load(config.PIPE_SPRITE).convert_alpha()
+        self.renderer = FlappyRenderer()
 
         self.generation = 1
         self.start_time = time.time()
 
-        self.engine = GameCore(self.bird_sprite, self.pipe_sprite_sheet, config.NUM_AGENTS)
+        # With workers, fitness comes from headless evaluation and only the fittest agents are shown
+        self.evaluator = ParallelEvaluator(config.NUM_WORKERS) if config.NUM_WORKERS > 1 else None
+        self.tracks = TrackLibrary()
+        num_shown = min(config.DISPLAY_AGENTS, config.NUM_AGENTS) if self.evaluator is not None else config.NUM_AGENTS
 
-        self.agents = []
+        self.engine = GameCore(num_shown)
+        self.observations = observations.allocate(num_shown)
+
+        self.population = None
         self.reset_generation()
 
     def reset_generation(self):
         """
         Resets all agents and birds for a new generation.
         Also handles fitness evaluation and saves the best agent.
-        """
-        if self.agents:
-            self.fitness_scores = []
-            for bird in self.engine.birds:
-                fitness = bird.score
-                self.fitness_scores.append(fitness)
 
-            best_index = max(range(len(self.agents)), key=lambda i: self.fitness_scores[i])
-            best_fitness = self.fitness_scores[best_index]
-            best_agent = self.agents[best_index]
+        Both modes select on flappy_fitness over the same seeded level, and the
+        genomes and GA draw from RUN_SEED, so training does not depend on NUM_WORKERS.
+        """
+        if self.population is not None:
+            if self.evaluator is None:
+                # The whole population just played the level; score it like the workers do
+                birds = self.engine.birds
+                self.fitness = flappy_fitness(np.array([bird.score for bird in birds]), np.array([bird.time_alive for bird in birds]))
 
-            save_best_agent(best_agent, best_fitness, self.generation, config.SAVE_MODEL_PATH)
+            # Save the plain score the fittest agent reached on screen
+            best_slot = int(np.argmax(self.fitness[self.shown]))
+            best_agent = self.population.agent(int(self.shown[best_slot]))
+            save_best_agent(best_agent, self.engine.birds[best_slot].score, self.generation, config.SAVE_MODEL_PATH)
 
-            self.agents = evolve_agents(self.agents, self.fitness_scores)
+            ga_rng = derive_rng(config.RUN_SEED, "ga", self.generation)
+            self.population, self.offspring = evolve_population(self.population, self.fitness, out=self.offspring, rng=ga_rng), self.population
 
         else:
-            self.agents = [Agent(INPUT_SIZE) for _ in range(config.NUM_AGENTS)]
-
+            self.population = Population.random(config.NUM_AGENTS, GenomeLayout(INPUT_SIZE), rng=derive_rng(config.RUN_SEED, "genomes"))
+            self.offspring = Population(np.empty_like(self.population.genomes), self.population.layout)  # Spare genome buffer for evolve_population
+            if self.evaluator is not None:
+                self.population, self.offspring = self.evaluator.share(self.population), self.evaluator.share(self.offspring)
+
+        seed = episode_seed(config.RUN_SEED, "flappy", self.generation)
+        self.engine.track = self.tracks.get("flappy", seed, FLAPPY_MAX_SCORE)
+        if self.evaluator is not None:
+            self.evaluate_generation()
+        else:
+            self.shown = np.arange(len(self.population))  # Population row of each bird
+            self.policy = CompactingPolicy(PopulationNetwork.from_population(self.population).compile_for("flappy"))
         self.engine.reset()
 
+    def evaluate_generation(self):
+        """
+        Scores the new generation across the worker pool on the engine's level,
+        then sets the engine up to replay it for the fittest agents.
+        """
+        track = self.engine.track
+        self.fitness = self.evaluator.evaluate(self.population, partial(evaluate_on_flappy, track=track), EVAL_CHUNK_SIZE)
 
-    def run(self):
-        running = True
-        while running:
-            self.clock.tick(config.FPS)
-            running = self.handle_events()
-
-            self.update()   # Uses agents to make decisions and update the game
-            self.draw()
+        self.shown = np.argsort(self.fitness)[::-1][:len(self.engine.birds)]
+        shown = Population(self.population.genomes[self.shown], self.population.layout)
+        self.policy = CompactingPolicy(PopulationNetwork.from_population(shown).compile_for("flappy"))
 
-            # When all birds are dead, evolve to next generation
-            if all(not bird.alive for bird in self.engine.birds):
-                self.generation += 1
-                self.reset_generation()
+    def generation_over(self):
+        """
+        True when every bird is dead, or when the level reached the evaluation's score cap.
+        """
+        if self.engine.score >= FLAPPY_MAX_SCORE:
+            return True
+        return all(not bird.alive for bird in self.engine.birds)
 
-        pygame.quit()
+    def run(self):
+        running = True
+        try:
+            while running:
+                self.clock.tick(config.FPS)
+                running = self.handle_events()
+
+                self.update()   # Uses agents to make decisions and update the game
+                self.draw()
+
+                # When all birds are dead, evolve to next generation
+                if self.generation_over():
+                    self.generation += 1
+                    self.reset_generation()
+        finally:
+            # Also runs when training is interrupted or fails; then the workers are killed
+            if self.evaluator is not None:
+                self.evaluator.close(terminate=running)
+            pygame.quit()
         
     def handle_events(self):
         for event in pygame.event.get():
@@ -83,13 +134,7 @@ class VisualTrainer:
 
     def draw(self):
         self.screen.blit(self.background, (0, 0))
-
-        for bird in self.engine.birds:
-            if bird.alive:
-                bird.draw(self.screen)
-
-        for pipe in self.engine.pipes:
-            pipe.draw(self.screen)
+        self.renderer.draw_world(self.screen, self.engine)
 
         elapsed = time.time() - self.start_time
         alive_count = sum(1 for bird in self.engine.birds if bird.alive)
@@ -107,66 +152,37 @@ class VisualTrainer:
         self.screen.blit(label, (x, y))
 
 
-    def get_inputs(self, bird, next_pipe):
-        if next_pipe:
-            dx = (next_pipe.x - bird.x) / config.SCREEN_WIDTH
-            dy = ((next_pipe.gap_y + next_pipe.gap_size / 2) - bird.y) / config.SCREEN_HEIGHT
-            gap_size = next_pipe.gap_size / config.SCREEN_HEIGHT
-            pipe_speed = next_pipe.speed / config.PIPE_SPEED
-            time_to_pipe = dx / (next_pipe.speed + 1e-5)
-        else:
-            dx = 1.0
-            dy = 0.0
-            gap_size = 0.0
-            pipe_speed = 1.0
-            time_to_pipe = 1.0
-
-        return [
-            bird.y / config.SCREEN_HEIGHT, 
-            bird.velocity_y / 10.0,
-            dx,
-            dy,
-            gap_size, 
-            pipe_speed,
-            time_to_pipe,
-            0.0,                                  # unused for Flappy
-            0.0,                                  # unused for Flappy
-            0.0,                                  # unused for Flappy
-            1.0,                                  # One-hot: Flappy
-            0.0                                   # One-hot: not Dino
-        ]
-
-
     def find_next_pipe(self):
         """
         Returns the next pipe (closest ahead of the bird).
         """
-        for pipe in self.engine.pipes:
-            if pipe.x + pipe.width > self.engine.birds[0].x:
-                return pipe
-        return self.engine.pipes[0] if self.engine.pipes else None
+        return self.find_next_pipe_for_bird(self.engine.birds[0], self.engine)
         
+    def decide_all(self, next_pipe):
+        """
+        Runs batched inference for every alive bird.
+
+        :return: Boolean array, one entry per bird; True = jump
+        """
+        alive = np.array(self.engine.alive_indices)
+        decisions = np.zeros(len(self.engine.birds), dtype=bool)
+        if len(alive):
+            inputs = observations.observe_birds(self.engine.birds, alive, next_pipe, self.observations)
+            decisions[alive] = self.policy.decide(inputs, alive)
+        return decisions
+
     def update(self):
         next_pipe = self.find_next_pipe()
-        decisions = []
+        decisions = self.decide_all(next_pipe)
         best_score = 0
         best_index = -1
         for i, bird in enumerate(self.engine.birds):
-            if not bird.alive:
-                decisions.append(False)
-                continue
-
-            agent = self.agents[i]
-            inputs = self.get_inputs(bird, next_pipe)
-            flappy_jump, _, _ = agent.decide(inputs)
-            decisions.append(flappy_jump)
-
-            if bird.score > best_score:
+            if bird.alive and bird.score > best_score:
                 best_score = bird.score
                 best_index = i
 
         if best_score % 50 == 0 and best_score != 0:
-            best_agent = self.agents[best_index]
+            best_agent = self.population.agent(self.shown[best_index])
             save_best_agent(best_agent, best_score, self.generation, config.SAVE_MODEL_PATH)
             print(f"[Checkpoint] Saved agent at score {best_score}")
 
@@ -185,9 +201,14 @@ class VisualTrainer:
             print("No saved agent found.")
             return
 
-        agent = create_agent_from_genome(best["genome"], input_size=INPUT_SIZE)
-        engine = GameCore(self.bird_sprite, self.pipe_sprite_sheet, num_agents=1)
+        agent = create_agent_from_genome(best["genome"], input_size=INPUT_SIZE, topology=best.get("topology"))
+        policy = PopulationNetwork.from_agents([agent]).compile_for("flappy")
+        engine = GameCore(num_agents=1)
         bird = engine.birds[0]
+        buffer = observations.allocate(1)
+        flappy_jump = False
+        activations = None
+        step = 0
 
         clock = pygame.time.Clock()
         running = True
@@ -202,11 +223,18 @@ class VisualTrainer:
                     if event.key == pygame.K_v:
                         visualizer_enabled = not visualizer_enabled
 
-            next_pipe = self.find_next_pipe_for_bird(bird, engine.pipes)
+            next_pipe = self.find_next_pipe_for_bird(bird, engine)
 
-            inputs = self.get_inputs(bird, next_pipe)
+            if step % config.DECISION_INTERVAL == 0:
+                inputs = observations.observe_birds(engine.birds, [0], next_pipe, buffer)
 
-            flappy_jump, _, _, activations = agent.decide_with_activations(inputs)
+                if visualizer_enabled:
+                    flappy_jump, _, _, activations = agent.decide_with_activations(inputs[0])
+                else:
+                    flappy_jump = policy.decide(inputs)[0]
+            elif not config.HOLD_ACTIONS:
+                flappy_jump = False
+            step += 1
             if flappy_jump:
                 bird.jump()
 
@@ -214,8 +242,8 @@ class VisualTrainer:
 
             self.screen.blit(self.background, (0, 0))
             for pipe in engine.pipes:
-                pipe.draw(self.screen)
-            bird.draw(self.screen)
+                self.renderer.draw_pipe(self.screen, pipe)
+            self.renderer.draw_bird(self.screen, bird)
 
             self.draw_text(f"Best Agent - Gen {best['generation']} / Fitness: {best['fitness']}", 10, 10)
             self.draw_text(f"Score: {engine.score}", 10, 40)
@@ -236,7 +264,7 @@ class VisualTrainer:
 
             output_labels = ["Flappy Jump"]
 
-            if visualizer_enabled:
+            if visualizer_enabled and activations is not None:
                 draw_network_visualization(
                     self.screen,
                     activations,
@@ -251,11 +279,11 @@ class VisualTrainer:
 
         pygame.quit()
 
-    def find_next_pipe_for_bird(self, bird, pipes):
-        for pipe in pipes:
-            if pipe.x + pipe.width > bird.x:
-                return pipe
-        return pipes[0] if pipes else None
+    def find_next_pipe_for_bird(self, bird, engine):
+        pipe = engine.next_pipe(bird.x)
+        if pipe is None and engine.pipes:
+            return engine.pipes[0]
+        return pipe
     
 class FlappyVisualizerWithConfig(VisualTrainer):
     def __init__(self, experiment_config: ExperimentConfig, shared_screen):
@@ -270,52 +298,37 @@ class FlappyVisualizerWithConfig(VisualTrainer):
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Arial", 24)
 
-        self.background = pygame.image.load(config.BG_IMAGE).convert()
-        self.background = pygame.transform.scale(self.background, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        self.background = assets.scaled(config.BG_IMAGE, (config.SCREEN_WIDTH, config.SCREEN_HEIGHT), alpha=False)
 
-        self.bird_sprite = pygame.image.load(config.BIRD_SPRITE).convert_alpha()
-        self.pipe_sprite_sheet = pygame.image.load(config.PIPE_SPRITE).convert_alpha()
+        self.renderer = FlappyRenderer()
 
         self.generation = 1
         self.start_time = time.time()
 
-        self.engine = GameCore(self.bird_sprite, self.pipe_sprite_sheet, experiment_config.num_agents)
+        self.engine = GameCore(experiment_config.num_agents)
+        self.observations = observations.allocate(experiment_config.num_agents)
 
-        self.agents = []
+        self.population = None
         self.reset_generation()
 
     def reset_generation(self):
-        if self.agents:
+        if self.population is not None:
             self.fitness_scores = [bird.score for bird in self.engine.birds]
-            best_index = max(range(len(self.agents)), key=lambda i: self.fitness_scores[i])
-            self.agents = evolve_agents(
-                self.agents, self.fitness_scores,
+            self.population, self.offspring = evolve_population(
+                self.population, self.fitness_scores,
                 retain_top=self.retain_top,
-                mutate_rate=self.mutation_rate
-            )
+                mutate_rate=self.mutation_rate,
+                out=self.offspring
+            ), self.population
         else:
-            self.agents = [Agent(INPUT_SIZE) for _ in range(self.experiment_config.num_agents)]
+            self.population = Population.random(self.experiment_config.num_agents, GenomeLayout(INPUT_SIZE))
+            self.offspring = Population(np.empty_like(self.population.genomes), self.population.layout)  # Spare genome buffer for evolve_population
+        self.policy = CompactingPolicy(PopulationNetwork.from_population(self.population).compile_for("flappy"))
         self.engine.reset()
 
     def update(self):
         next_pipe = self.find_next_pipe()
-        decisions = []
-        best_score = 0
-        best_index = -1
-
-        for i, bird in enumerate(self.engine.birds):
-            if not bird.alive:
-                decisions.append(False)
-                continue
-
-            agent = self.agents[i]
-            inputs = self.get_inputs(bird, next_pipe)
-            flappy_jump, _, _ = agent.decide(inputs)
-            decisions.append(flappy_jump)
-
-            if bird.score > best_score:
-                best_score = bird.score
-                best_index = i
+        decisions = self.decide_all(next_pipe)
 
         self.engine.update(agent_decisions=decisions)
 
@@ -326,13 +339,7 @@ class FlappyVisualizerWithConfig(VisualTrainer):
     def draw(self):
         surface = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
         surface.blit(self.background, (0, 0))
-
-        for bird in self.engine.birds:
-            if bird.alive:
-                bird.draw(surface)
-
-        for pipe in self.engine.pipes:
-            pipe.draw(surface)
+        self.renderer.draw_world(surface, self.engine)
 
         elapsed = time.time() - self.start_time
         alive_count = sum(1 for bird in self.engine.birds if bird.alive)
@@ -0,0 +1,199 @@
+"""
+world.py
+
+Defines the FlappyWorld class, a vectorized headless Flappy simulation for
+training. Instead of one Bird object per agent, bird state is stored as
+struct-of-arrays (y, velocity, alive, score, time_alive) and pipes live in a
+small fixed-capacity array, so physics, collisions and scoring for the whole
+population take a few NumPy operations per frame. Those operations gather
+only the rows of the surviving birds (alive_rows), so a frame costs in
+proportion to the survivors, not to the population.
+
+Physics, pipe spawning and collision bounds are identical to GameCore.
+"""
+
+import numpy as np
+from games.clock import SimulationClock
+from games.flappy import config
+
+# Initial number of pipe slots; grows if more pipes are on screen at once
+PIPE_CAPACITY = 8
+
+
+class FlappyWorld:
+    """
+    Vectorized Flappy game state for a population of birds.
+    All birds share the same x position and the same pipes.
+    """
+
+    def __init__(self, num_agents=1, clock=None, rng=None, track=None):
+        """
+        :param clock: Time source advanced once per update; a SimulationClock at config.FPS if None
+        :param rng: numpy Generator for level randomness; a fresh unseeded one if None
+        :param track: Precomputed level (see games.tracks); when given, pipes are spawned
+                      from it instead of from the clock and rng
+        """
+        self.num_agents = num_agents
+        self.clock = clock if clock is not None else SimulationClock(config.FPS)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.track = track
+        self.bird_x = config.BIRD_X
+        self.radius = config.BIRD_RADIUS
+
+        n = num_agents
+        self.bird_y = np.empty(n)
+        self.bird_velocity = np.empty(n)
+        self.bird_alive = np.empty(n, dtype=bool)
+        self.bird_score = np.empty(n, dtype=np.int64)
+        self.bird_time_alive = np.empty(n, dtype=np.int64)
+
+        # Pipes in spawn order (leftmost first); only the first num_pipes slots are used
+        self.pipe_x = np.zeros(PIPE_CAPACITY)
+        self.pipe_gap_y = np.zeros(PIPE_CAPACITY)
+        self.pipe_passed = np.zeros(PIPE_CAPACITY, dtype=bool)
+
+        self.reset()
+
+    def reset(self):
+        """
+        Resets the game state. Arrays are overwritten in place, so a world can
+        be reused across generations without reallocating.
+        """
+        self.bird_y.fill(config.SCREEN_HEIGHT // 2)
+        self.bird_velocity.fill(0)
+        self.bird_alive.fill(True)
+        self.bird_score.fill(0)
+        self.bird_time_alive.fill(0)
+
+        self.alive_rows = np.arange(self.num_agents)  # Sorted indices of the live birds
+
+        self.num_pipes = 0
+        self.pipes_spawned = 0
+
+        self.frame = 0
+        self.track_index = 0
+        self.last_pipe_time = self.clock.ticks()
+        self.score = 0
+        self.alive = True
+
+    def spawn_pipe(self, gap_y=None):
+        """
+        Spawns a new pipe at the right edge.
+
+        :param gap_y: Top of the gap; drawn from rng if None
+        """
+        if self.num_pipes == len(self.pipe_x):
+            capacity = 2 * len(self.pipe_x)
+            self.pipe_x = np.resize(self.pipe_x, capacity)
+            self.pipe_gap_y = np.resize(self.pipe_gap_y, capacity)
+            self.pipe_passed = np.resize(self.pipe_passed, capacity)
+
+        i = self.num_pipes
+        self.pipe_x[i] = config.SCREEN_WIDTH
+        self.pipe_gap_y[i] = gap_y if gap_y is not None else self.rng.integers(100, config.SCREEN_HEIGHT - 200, endpoint=True)
+        self.pipe_passed[i] = False
+        self.num_pipes += 1
+        self.pipes_spawned += 1
+
+    def spawn_from_track(self):
+        """
+        Spawns the pipes the track schedules for the current frame.
+        """
+        track = self.track
+        while self.track_index < len(track) and track["frame"][self.track_index] == self.frame:
+            self.spawn_pipe(track["gap_y"][self.track_index])
+            self.track_index += 1
+
+    def remove_offscreen_pipes(self):
+        """
+        Drops pipes that left the screen. They are always the leftmost ones,
+        so the remaining slots are shifted to the front.
+        """
+        n = self.num_pipes
+        gone = int(np.count_nonzero(self.pipe_x[:n] + config.PIPE_WIDTH < 0))
+        if gone:
+            for array in (self.pipe_x, self.pipe_gap_y, self.pipe_passed):
+                array[:n - gone] = array[gone:n]
+            self.num_pipes = n - gone
+
+    def update(self, jump=None):
+        """
+        Advances the world by one frame.
+
+        :param jump: Boolean array, one entry per bird; True = jump. Entries of dead birds are ignored.
+        """
+        self.clock.tick()
+        self.frame += 1
+        if self.track is not None:
+            self.spawn_from_track()
+        else:
+            now = self.clock.ticks()
+            if now - self.last_pipe_time > config.PIPE_INTERVAL:
+                self.spawn_pipe()
+                self.last_pipe_time = now
+
+        self.pipe_x[:self.num_pipes] -= config.PIPE_SPEED
+        self.remove_offscreen_pipes()
+
+        # Only live birds are gathered; dead birds keep their last state
+        rows = self.alive_rows
+        velocity = self.bird_velocity[rows]
+        if jump is not None:
+            velocity[jump[rows]] = config.BIRD_JUMP_STRENGTH
+        velocity += config.BIRD_GRAVITY
+        y = self.bird_y[rows] + velocity
+        self.bird_velocity[rows] = velocity
+        self.bird_y[rows] = y
+        self.bird_time_alive[rows] += 1
+
+        hit = self.check_collisions(y)
+        if hit.any():
+            self.bird_alive[rows[hit]] = False
+            self.alive_rows = rows = rows[~hit]
+
+        n = self.num_pipes
+        passed = ~self.pipe_passed[:n] & (self.pipe_x[:n] + config.PIPE_WIDTH < self.bird_x)
+        passed_count = int(np.count_nonzero(passed))
+        if passed_count:
+            self.pipe_passed[:n] |= passed
+            self.bird_score[rows] += passed_count  # Give each surviving bird the score
+            self.score += passed_count
+
+        self.alive = len(rows) > 0
+
+    def check_collisions(self, y):
+        """
+        Collision detection for a batch of birds at once. Only pipes overlapping
+        the birds' column horizontally are tested.
+
+        :param y: Heights of the birds to test, e.g. bird_y[alive_rows]
+        :return: Boolean array like y, True where a bird hits a pipe or leaves the screen
+        """
+        top = y - self.radius
+        bottom = y + self.radius
+        hit = (y < 0) | (y > config.SCREEN_HEIGHT)
+
+        n = self.num_pipes
+        overlapping = (
+            (self.bird_x + self.radius > self.pipe_x[:n]) &
+            (self.bird_x - self.radius < self.pipe_x[:n] + config.PIPE_WIDTH)
+        )
+        for gap_y in self.pipe_gap_y[:n][overlapping]:
+            gap_bottom = gap_y + config.PIPE_GAP_SIZE
+            hit |= (bottom > 0) & (top < gap_y)                               # Top pipe
+            hit |= (bottom > gap_bottom) & (top < config.SCREEN_HEIGHT)      # Bottom pipe
+        return hit
+
+    def next_pipe(self):
+        """
+        :return: Slot of the closest pipe ahead of the birds, or None
+        """
+        n = self.num_pipes
+        ahead = np.flatnonzero(self.pipe_x[:n] + config.PIPE_WIDTH > self.bird_x)
+        return int(ahead[0]) if len(ahead) else None
+
+    def alive_indices(self):
+        """
+        :return: Sorted indices of the birds that are still alive (do not modify)
+        """
+        return self.alive_rows
\ No newline at end of file
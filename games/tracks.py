@@ -0,0 +1,164 @@
+"""
+tracks.py
+
+Precomputed level tracks. A track is the full spawn schedule of one level:
+for Flappy the frame and gap position of every pipe, for Dino the frame, type
+and speed of every obstacle. Every agent of a generation faces the same level,
+so the schedule is generated once per seed (by running the world without any
+agents) and then replayed by GameCore/FlappyWorld and DinoCore/DinoWorld,
+which spawn from the track instead of drawing from their rng.
+
+Tracks are small structured arrays stored as .npy files and opened
+memory-mapped read-only, so any number of evaluators can share one copy.
+Replaying a track gives exactly the level the same seed would generate live.
+File names carry a fingerprint of the config values the level generator
+reads, so a track saved before one of them changed is rebuilt, not replayed.
+"""
+from collections import OrderedDict
+import hashlib
+import os
+import numpy as np
+from games.flappy.world import FlappyWorld
+from games.dino.world import DinoWorld
+import games.flappy.config as flappy_config
+import games.dino.config as dino_config
+
+FLAPPY_TRACK_DTYPE = np.dtype([("frame", "<i4"), ("gap_y", "<i2")])
+DINO_TRACK_DTYPE = np.dtype([("frame", "<i4"), ("flying", "?"), ("speed", "<f8")])
+
+# Spawns recorded beyond the max score, for pipes/obstacles still on screen
+TRACK_MARGIN = 8
+
+# Tracks a TrackLibrary keeps in memory, least recently used dropped first.
+# Training uses a new seed per game and generation, so only the latest ones
+# are ever asked for again; evicted tracks are reloaded from disk if kept there.
+TRACK_CACHE_SIZE = 4
+
+# Config values that shape a game's spawn schedule, as (config module, names)
+LEVEL_PARAMETERS = {
+    "flappy": (flappy_config, ("FPS", "SCREEN_WIDTH", "SCREEN_HEIGHT", "PIPE_INTERVAL")),
+    "dino": (dino_config, ("FPS", "SCREEN_WIDTH", "BASE_SPEED", "MIN_OBSTACLE_DELAY", "MAX_OBSTACLE_DELAY",
+                           "CACTUS_SIZE", "FLYING_OBSTACLE_SIZE")),
+}
+
+
+def track_length(max_score: int) -> int:
+    """
+    :return: Number of spawns a track needs to last until max_score
+    """
+    return max_score + TRACK_MARGIN
+
+
+def level_fingerprint(game: str) -> str:
+    """
+    :return: Short hash of the current values of the game's LEVEL_PARAMETERS
+    """
+    module, names = LEVEL_PARAMETERS[game]
+    values = repr([(name, getattr(module, name)) for name in names])
+    return hashlib.sha1(values.encode()).hexdigest()[:8]
+
+
+def build_flappy_track(seed, length: int) -> np.ndarray:
+    """
+    Records the first `length` pipes of the Flappy level for a seed.
+
+    :param seed: Level seed (anything np.random.default_rng accepts)
+    """
+    world = FlappyWorld(num_agents=0, rng=np.random.default_rng(seed))
+    track = np.zeros(length, dtype=FLAPPY_TRACK_DTYPE)
+    while world.pipes_spawned < length:
+        spawned = world.pipes_spawned
+        world.update()
+        if world.pipes_spawned > spawned:
+            track[spawned] = (world.frame, world.pipe_gap_y[world.num_pipes - 1])
+    return track
+
+
+def build_dino_track(seed, length: int) -> np.ndarray:
+    """
+    Records the first `length` obstacles of the Dino level for a seed.
+
+    :param seed: Level seed (anything np.random.default_rng accepts)
+    """
+    world = DinoWorld(num_agents=0, rng=np.random.default_rng(seed))
+    track = np.zeros(length, dtype=DINO_TRACK_DTYPE)
+    while world.obstacles_spawned < length:
+        spawned = world.obstacles_spawned
+        world.update()
+        if world.obstacles_spawned > spawned:
+            n = world.num_obstacles - 1
+            track[spawned] = (world.frame, world.obstacle_flying[n], world.obstacle_speed[n])
+    return track
+
+
+BUILDERS = {
+    "flappy": build_flappy_track,
+    "dino": build_dino_track,
+}
+
+
+def save_track(path: str, track: np.ndarray):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.save(path, track)
+
+
+def load_track(path: str) -> np.ndarray:
+    """
+    Opens a saved track memory-mapped and read-only.
+    """
+    return np.load(path, mmap_mode="r")
+
+
+class TrackLibrary:
+    """
+    Tracks of one experiment, keyed by game, level fingerprint and seed. With
+    a directory they are built once and reused from disk by every evaluator and
+    later run; without one they are only kept in memory. At most cache_size
+    tracks are held in memory at a time.
+    """
+
+    def __init__(self, directory: str | None = None, cache_size: int = TRACK_CACHE_SIZE):
+        self.directory = directory
+        self.cache_size = cache_size
+        self.tracks = OrderedDict()  # Most recently used last
+
+    def path(self, game: str, seed) -> str:
+        seed_key = "-".join(str(part) for part in np.atleast_1d(seed))
+        return os.path.join(self.directory, f"{game}_{level_fingerprint(game)}_{seed_key}.npy")
+
+    def get(self, game: str, seed, max_score: int) -> np.ndarray:
+        """
+        Returns the track for a game and seed, loading or building it on first use.
+
+        :param game: "flappy" or "dino"
+        :param seed: Level seed, as passed to the world's rng
+        :param max_score: Score the track has to last for
+        """
+        length = track_length(max_score)
+        key = (game, level_fingerprint(game), tuple(np.atleast_1d(seed).tolist()))
+        track = self.tracks.get(key)
+        if track is not None and len(track) >= length:
+            self.tracks.move_to_end(key)
+            return track
+
+        path = self.path(game, seed) if self.directory else None
+        if path and os.path.exists(path):
+            track = load_track(path)
+        if track is None or len(track) < length:
+            track = BUILDERS[game](seed, length)
+            if path:
+                save_track(path, track)
+                track = load_track(path)
+        self.tracks[key] = track
+        self.tracks.move_to_end(key)
+        while len(self.tracks) > self.cache_size:
+            self.tracks.popitem(last=False)
+        return track
+
+    def prebuild(self, game: str, seeds, max_score: int):
+        """
+        Builds (or loads) the tracks of many seeds up front, e.g. one per generation.
+        Only useful with a directory: beyond cache_size, tracks are not kept in memory.
+        """
+        for seed in seeds:
+            self.get(game, seed, max_score)
\ No newline at end of file